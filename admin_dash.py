@@ -1,15 +1,30 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import datetime
-import gspread
-import json
 import time
-from google.oauth2.service_account import Credentials
+import os
+import hashlib
+from sheet_snapshot import SheetSnapshot, read_row
+from storage import get_storage
+from schema import REVIEW_HEADERS
+from candidate_index import CandidateIndex
+from aggregates import Aggregates
+from analytics import CUBE_DIMENSIONS, build_cube, first_choice, slice_table, rollup
+from search_index import SearchIndex
+from form_options import MULTISELECT_COLUMNS
+from bitsets import encode_frame, option_mask, option_counts, has_all, has_any
+from journal import Journal, JOURNAL_PATH, start_flusher, PENDING, INFLIGHT, FLUSHED
+from rescore import rescore_sheet
+from scoring import SCORING_SPEC, build_features, default_rubric, score_features
+from sheets_client import GUARD
+import perf
 
 # ------------------------------
 # PAGE CONFIG & STYLES
 # ------------------------------
 st.set_page_config(page_title="ITC Club — Admin Dashboard", layout="wide", page_icon="🛠️")
+perf.begin_rerun("admin")
 st.image("IMG_20251102_204411_811.png", use_container_width=True)
 
 st.markdown("""
@@ -63,49 +78,53 @@ st.markdown('<div class="big-title">🛠️ ITC Club — Admin Dashboard</div>',
 SHEET_ID_form = "1wpyHQf51TxG7mUM6MikyGBsz9maN471y1sO03BPOEUo"
 SHEET_ID_Reviews = "18uodDjMAL3_haYUwoBEbM1cNtvsQKIcldAjjZKnQJd8"
 
-def get_gspread_client():
-    try:
-        info = st.secrets["gcp_service_account"]["key"]
-        info = json.loads(info)
-        creds = Credentials.from_service_account_info(
-            info, scopes=["https://www.googleapis.com/auth/spreadsheets"]
-        )
-        client = gspread.authorize(creds)
-        return client
-    except Exception as e:
-        st.error(f"❌ Error creating GSpread client: {e}")
-        st.stop()
-
+# Tables come from the configured storage backend (see storage.py): the Google
+# Sheets through the pooled client by default, or the local SQLite store.
 
 # -------------------------------
 # FORM SHEET (user responses)
 # -------------------------------
-@st.cache_resource
 def open_form_sheet(sheet_id):
-    client = get_gspread_client()
     try:
-        sheet = client.open_by_key(sheet_id).sheet1
-        return sheet
+        return get_storage(sheet_id, SHEET_ID_Reviews).table("submissions")
     except Exception as e:
         st.error(f"❌ Could not connect to Form Sheet: {e}")
         st.stop()
- 
-form_sheet = open_form_sheet(SHEET_ID_form)
+
 
 # -------------------------------
 # REVIEWS SHEET (admin evaluations)
 # -------------------------------
-@st.cache_resource
 def open_reviews_sheet(sheet_id):
-    client = get_gspread_client()
-    try:
-        sheet = client.open_by_key(sheet_id).sheet1
-        return sheet
-    except Exception as e:
-        st.error(f"❌ Could not connect to Form Sheet: {e}")
-        st.stop()
- 
-review_sheet = open_reviews_sheet(SHEET_ID_Reviews)
+    # created with its header row on first use
+    return get_storage(SHEET_ID_form, sheet_id).table("reviews")
+
+
+# -------------------------------
+# REVIEW OUTBOX
+# -------------------------------
+# Saved reviews land in the local journal and are appended to Admin_Reviews in
+# batches by a background flusher. Admin_Name + Student_Name + Date identify a
+# review, which is what the flusher checks before retrying a batch.
+REVIEW_KEY_COLUMNS = [
+    REVIEW_HEADERS.index("Admin_Name"),
+    REVIEW_HEADERS.index("Student_Name"),
+    REVIEW_HEADERS.index("Date"),
+]
+
+@perf.tracked(st.cache_resource)
+def get_review_outbox(sheet_id):
+    outbox = Journal(JOURNAL_PATH, "reviews", REVIEW_KEY_COLUMNS)
+    flusher = start_flusher(outbox, lambda: open_reviews_sheet(sheet_id), batch_size=50,
+                            value_input_option="RAW")
+    return outbox, flusher
+
+SYNC_LABELS = {
+    PENDING: "⏳ saved (pending sync)",
+    INFLIGHT: "📤 syncing",
+    FLUSHED: "✅ synced",
+}
+
 
 # ------------------------------
 # ADMIN LOGIN
@@ -123,11 +142,259 @@ if pwd != ADMIN_PASSWORD or not admin_name.strip():
     st.stop()
 
 # ------------------------------
-# LOAD DATA
+# LOAD DATA (incremental snapshots shared by all admin sessions)
+# ------------------------------
+# Columns the overview needs; long free-text answers are only read on demand
+OVERVIEW_COLUMNS = (
+    "Name", "Email", "Student_ID", "Department", "Academic_Year",
+    "Domain_Interest_Order", "Tech_Score", "Media_Score", "Sponsor_Score",
+    "Total_Score", "Submission_Date",
+)
+
+# Free-text search: names, contacts and the long answers
+SEARCH_COLUMNS = (
+    "Name", "Email", "Phone", "Student_ID", "Department", "Discord_ID",
+    "Tech_Project_Desc", "Media_Project_Desc", "Sponsor_Exp_Desc",
+    "Why_Join", "What_Learn", "Other_Club", "Leadership", "Challenge",
+    "Manage_Time", "Anything_To_Add",
+)
+
+# Multi-select answers for the facet filters
+FACET_COLUMNS = tuple(MULTISELECT_COLUMNS)
+
+# Answers needed to rescore
+SCORING_COLUMNS = ("Name", "Email", "Domain_Interest_Order", "Total_Score") + tuple(
+    column for spec in SCORING_SPEC.values() for _, _, column, _, _ in spec
+)
+
+# Every snapshot the page reads from (None = all columns)
+SNAPSHOT_COLUMN_SETS = (OVERVIEW_COLUMNS, SEARCH_COLUMNS, FACET_COLUMNS, SCORING_COLUMNS, None)
+
+SNAPSHOT_DIR = ".snapshots"
+
+@perf.tracked(st.cache_resource)
+def get_form_snapshot(sheet_id, columns=None):
+    # rendered from the local Parquet copy right away, synced in the background
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    name = "all" if columns is None else hashlib.md5(",".join(columns).encode()).hexdigest()[:8]
+    store = get_storage(sheet_id, SHEET_ID_Reviews)
+    return SheetSnapshot(
+        lambda: store.table("submissions"), columns,
+        cache_path=os.path.join(SNAPSHOT_DIR, f"{store.backend}-{sheet_id}-{name}.parquet"),
+    )
+
+# One typed frame per snapshot version, shared by every admin session (cache_data
+# would hand each session its own copy). Treat it as read-only: filter with
+# boolean masks, never assign into it.
+@perf.tracked(st.cache_resource(max_entries=8, show_spinner=False))
+def snapshot_frame(sheet_id, columns, version):
+    return get_form_snapshot(sheet_id, columns).frame()
+
+@perf.span("load_submissions")
+def load_submissions(sheet_id, columns=None):
+    """(frame, version): anything derived from the frame should key off this
+    version, not snapshot.version, which a background sync may bump meanwhile."""
+    snapshot = get_form_snapshot(sheet_id, columns)
+    snapshot.refresh()
+    version = snapshot.version
+    return snapshot_frame(sheet_id, columns, version), version
+
+@perf.tracked(st.cache_data(ttl=60))
+def load_candidate_row(sheet_id, row_number):
+    return read_row(open_form_sheet(sheet_id), row_number)
+
+def reset_snapshots(sheet_id):
+    """Make every snapshot re-read the sheet on its next use."""
+    for columns in SNAPSHOT_COLUMN_SETS:
+        get_form_snapshot(sheet_id, columns).reset()
+    load_candidate_row.clear()
+
+if st.button("🔄 Refresh now"):
+    reset_snapshots(SHEET_ID_form)
+
+try:
+    with st.spinner("Loading submissions..."):
+        df, df_version = load_submissions(SHEET_ID_form, OVERVIEW_COLUMNS)
+except Exception as e:
+    st.error(f"❌ Could not load submissions: {e}")
+    st.stop()
+
+snapshot = get_form_snapshot(SHEET_ID_form, OVERVIEW_COLUMNS)
+
+@perf.tracked(st.cache_resource)
+def get_aggregates(sheet_id):
+    # kept next to the overview snapshot's Parquet file
+    return Aggregates(f"{get_form_snapshot(sheet_id, OVERVIEW_COLUMNS).cache_path}.agg.json")
+
+aggregates = get_aggregates(SHEET_ID_form)
+with perf.span("aggregates.sync"):
+    aggregates.sync(snapshot)  # folds in only rows appended since the last rerun
+
+if snapshot.last_error is not None:
+    st.warning(f"⚠️ Google Sheets is unreachable — showing the local snapshot (read-only). {snapshot.last_error}")
+elif snapshot.synced_at:
+    st.caption(f"Synced at {datetime.datetime.fromtimestamp(snapshot.synced_at):%H:%M:%S}")
+
+CANDIDATE_MATCHES = 50  # selectbox options for a typed query; an empty one lists everyone
+
+@perf.tracked(st.cache_resource(max_entries=2))
+def candidate_index(sheet_id, version, _frame):
+    # one keyed index per snapshot version, shared by all admin sessions; built
+    # from the frame the page is showing so its row numbers resolve in `df`
+    return CandidateIndex(_frame)
+
+# Free-text search, indexed once and then only for rows appended since the last sync
+@perf.tracked(st.cache_resource)
+def get_search_index(sheet_id):
+    return SearchIndex()
+
+@perf.span("search_rows")
+def search_rows(sheet_id, query):
+    snapshot = get_form_snapshot(sheet_id, SEARCH_COLUMNS)
+    snapshot.refresh()
+    index = get_search_index(sheet_id)
+    index.sync(snapshot)
+    return index.search(query)
+
+# Multi-select answers as bitmasks, decoded once per snapshot version
+@perf.tracked(st.cache_resource(max_entries=2))
+def facet_codes(sheet_id, version):
+    return encode_frame(get_form_snapshot(sheet_id, FACET_COLUMNS).frame())
+
+@perf.span("load_facets")
+def load_facets(sheet_id):
+    snapshot = get_form_snapshot(sheet_id, FACET_COLUMNS)
+    snapshot.refresh()
+    return facet_codes(sheet_id, snapshot.version)
+
+# ------------------------------
+# ANALYTICS CUBE
+# ------------------------------
+# Group-bys run once per snapshot version; the drill-down charts only slice them
+@perf.tracked(st.cache_data(max_entries=4, show_spinner=False))
+def analytics_cube(sheet_id, version, facet_version=None):
+    frame = snapshot_frame(sheet_id, OVERVIEW_COLUMNS, version)
+    codes = facet_codes(sheet_id, facet_version) if facet_version is not None else None
+    return build_cube(frame, codes)
+
+def render_breakdowns():
+    try:
+        facets = get_form_snapshot(SHEET_ID_form, FACET_COLUMNS)
+        facets.refresh()
+        facet_version = facets.version
+    except Exception as e:
+        st.caption(f"Language/tool popularity is unavailable right now: {e}")
+        facet_version = None
+    cube = analytics_cube(SHEET_ID_form, df_version, facet_version)
+
+    filters = {}
+    for col, dim in zip(st.columns(3), CUBE_DIMENSIONS):
+        value = col.selectbox(dim.replace("_", " "), ["All"] + sorted(cube["cube"][dim].unique()), key=f"cube-{dim}")
+        filters[dim] = None if value == "All" else value
+    sliced = slice_table(cube["cube"], **filters)
+    st.metric("Applicants in selection", int(sliced["count"].sum()))
+
+    by = st.radio("Break down by", CUBE_DIMENSIONS, horizontal=True, key="cube-by")
+    table = rollup(sliced, by)
+    st.bar_chart(table["count"])
+    st.dataframe(table, use_container_width=True)
+
+    st.markdown("**Total_Score distribution per first choice**")
+    scores = slice_table(cube["scores"], First_Choice=filters["First_Choice"])
+    scores = scores[scores["First_Choice"] != ""]  # no domain answered: nothing to name a series by
+    if scores.empty:
+        st.info("No first-choice answers to chart yet.")
+    else:
+        st.bar_chart(scores.pivot_table(index="Bucket", columns="First_Choice", values="count", fill_value=0))
+
+    if filters["First_Choice"] in (None, "Tech") and not cube["popularity"].empty:
+        st.markdown("**Popularity among first-choice Tech applicants**")
+        popularity = slice_table(cube["popularity"], Department=filters["Department"],
+                                 Academic_Year=filters["Academic_Year"])
+        for col, (question, part) in zip(st.columns(2), popularity.groupby("Question")):
+            col.caption(question.replace("_", " "))
+            col.bar_chart(part.groupby("Option")["count"].sum().sort_values(ascending=False))
+
+# ------------------------------
+# WHAT-IF RUBRIC SIMULATOR
 # ------------------------------
-df = pd.DataFrame(form_sheet.get_all_records())
-if "Total_Score" in df.columns:
-    df["Total_Score"] = pd.to_numeric(df["Total_Score"], errors="coerce").fillna(0)
+# Answers decoded once per snapshot into feature matrices
+@perf.tracked(st.cache_resource(max_entries=2))
+def scoring_features(sheet_id, version):
+    frame = get_form_snapshot(sheet_id, SCORING_COLUMNS).frame()
+    return frame, build_features(frame)
+
+@perf.tracked(st.cache_data(ttl=300, show_spinner=False))
+def load_latest_reviews(sheet_id):
+    # latest review per student: a window query on SQLite, a sheet read otherwise
+    try:
+        return get_storage(SHEET_ID_form, sheet_id).latest_reviews()
+    except Exception:
+        return pd.DataFrame()
+
+def points_slider(label, value, key):
+    return st.slider(label, 0, max(20, int(value) * 2), int(value), key=key)
+
+def render_rubric_simulator():
+    snap = get_form_snapshot(SHEET_ID_form, SCORING_COLUMNS)
+    snap.refresh()
+    base, features = scoring_features(SHEET_ID_form, snap.version)
+    rubric = default_rubric()
+
+    t_tech, t_media, t_sponsor, t_weights = st.tabs(["💻 Tech", "🎨 Media", "💼 Sponsoring", "⚖️ Weights"])
+    for tab, domain in [(t_tech, "Tech"), (t_media, "Media"), (t_sponsor, "Sponsoring")]:
+        with tab:
+            for key, table in rubric[domain].items():
+                if isinstance(table, dict):
+                    st.markdown(f"**{key.replace('_', ' ').capitalize()}**")
+                    for answer, pts in table.items():
+                        label = f"Rate {answer}" if isinstance(answer, int) else answer
+                        table[answer] = points_slider(label, pts, f"sim-{domain}-{key}-{answer}")
+                else:
+                    label = f"{key.replace('_', ' ').capitalize()} — points per selected option"
+                    rubric[domain][key] = points_slider(label, table, f"sim-{domain}-{key}")
+    with t_weights:
+        w = rubric["domain_weights"]
+        c1, c2, c3, c4 = st.columns(4)
+        w[0] = c1.slider("1st choice weight", 0.0, 1.0, w[0], 0.05, key="sim-w0")
+        w[1] = c2.slider("2nd choice weight", 0.0, 1.0, w[1], 0.05, key="sim-w1")
+        w[2] = c3.slider("3rd choice weight", 0.0, 1.0, w[2], 0.05, key="sim-w2")
+        rubric["divisor"] = c4.slider("Divisor", 1.0, 5.0, float(rubric["divisor"]), 0.5, key="sim-div")
+        rubric["sponsor_choice_counts"] = st.checkbox(
+            "Count the 'Sponsor' choice in the weighted total", key="sim-sponsor"
+        )
+        st.markdown("**Review formula** — ((domain final + skills) × mix) × a + motivation × b")
+        r1, r2, r3 = st.columns(3)
+        mix = r1.slider("Domain / skills mix", 0.0, 1.0, 0.5, 0.05, key="sim-mix")
+        weight_a = r2.slider("a (domain + skills)", 0.0, 1.0, 0.6, 0.05, key="sim-a")
+        weight_b = r3.slider("b (motivation)", 0.0, 1.0, 0.4, 0.05, key="sim-b")
+
+    sim = score_features(features, rubric)
+    ranking = base[["Name", "Email", "Domain_Interest_Order"]].copy()
+    ranking["Stored_Total"] = base["Total_Score"].astype(float).round(2)
+    ranking["Simulated_Total"] = sim["Total_Score"]
+
+    reviews = load_latest_reviews(SHEET_ID_Reviews)
+    if not reviews.empty:
+        matched = reviews.reindex(ranking["Name"])
+        skills = pd.to_numeric(matched["Skills_Score"], errors="coerce").to_numpy()
+        motivation = pd.to_numeric(matched["Motivation_Score"], errors="coerce").to_numpy()
+        domain_final = sim["Total_Score"] * 3 + 2
+        ranking["Simulated_Review_Total"] = np.round(
+            (domain_final + skills) * mix * weight_a + motivation * weight_b, 2
+        )
+
+    sort_by = "Simulated_Review_Total" if "Simulated_Review_Total" in ranking.columns else "Simulated_Total"
+    ranking["Stored_Rank"] = ranking["Stored_Total"].rank(method="first", ascending=False).astype(int)
+    ranking["Simulated_Rank"] = ranking[sort_by].fillna(-1).rank(method="first", ascending=False).astype(int)
+    ranking["Rank_Change"] = ranking["Stored_Rank"] - ranking["Simulated_Rank"]
+    ranking = ranking.sort_values("Simulated_Rank")
+
+    m1, m2 = st.columns(2)
+    m1.metric("Applicants ranked", len(ranking))
+    m2.metric("Rankings changed", int((ranking["Rank_Change"] != 0).sum()))
+    top = st.number_input("Show top", 10, max(10, len(ranking)), min(100, max(10, len(ranking))), 10, key="sim-top")
+    st.dataframe(ranking.head(int(top)), use_container_width=True, hide_index=True)
 
 # ------------------------------
 # TABS
@@ -143,35 +410,62 @@ st.markdown(
     """,
     unsafe_allow_html=True
 )
-tab1, tab2, tab3 = st.tabs(["📊 **Dashboard**", "📋 **Submissions**", "📝 **Review**"])
+tab1, tab2, tab3, tab4 = st.tabs(["📊 **Dashboard**", "📋 **Submissions**", "📝 **Review**", "⚙️ **Performance**"])
 
 # ------------------------------
 # 📊 DASHBOARD TAB
 # ------------------------------
-with tab1:
+with tab1, perf.span("render.dashboard"):
     st.subheader("Overview Metrics")
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.markdown(f"<div class='metric-card'><h3>👥 Total Applicants</h3><h1>{len(df)}</h1></div>", unsafe_allow_html=True)
+        st.markdown(f"<div class='metric-card'><h3>👥 Total Applicants</h3><h1>{aggregates.count}</h1></div>", unsafe_allow_html=True)
     with col2:
-        avg = round(df['Total_Score'].mean(), 2) if 'Total_Score' in df.columns else 0
+        avg = round(aggregates.mean_score, 2)
         st.markdown(f"<div class='metric-card'><h3>⭐ Average Score</h3><h1>{avg}</h1></div>", unsafe_allow_html=True)
     with col3:
-        if "Department" in df.columns:
-            dept_count = df["Department"].nunique()
-        else:
-            dept_count = 0
+        dept_count = aggregates.distinct("Department")
         st.markdown(f"<div class='metric-card'><h3>🏛 Departments</h3><h1>{dept_count}</h1></div>", unsafe_allow_html=True)
 
     st.divider()
-    if "Domain_Interest_Order" in df.columns:
+    if aggregates.count:
         st.subheader("📈 Applicants per Domain")
-        st.bar_chart(df["Domain_Interest_Order"].value_counts())
+        st.bar_chart(pd.Series(aggregates.counts("Domain_Interest_Order"), name="count"))
+        st.subheader("📊 Score Distribution")
+        st.bar_chart(pd.Series(aggregates.histogram(), name="applicants").rename_axis("Total_Score from"))
+
+    st.divider()
+    with st.expander("🔍 Breakdowns (domain × department × year)"):
+        render_breakdowns()
+
+    st.divider()
+    if st.toggle("🧪 What-if rubric simulator"):
+        render_rubric_simulator()
+
+    with st.expander("♻️ Rescore all applicants with the current rubric"):
+        st.caption("Reads the sheet once and rewrites only the score cells that changed (one batch update).")
+        rc1, rc2 = st.columns(2)
+        if rc1.button("🔍 Preview changes (dry run)"):
+            try:
+                st.session_state.rescore_preview = rescore_sheet(open_form_sheet(SHEET_ID_form), dry_run=True)
+            except Exception as e:
+                st.error(f"⚠️ Error computing rescore: {e}")
+        if rc2.button("✍️ Apply rescore"):
+            try:
+                st.session_state.rescore_preview = rescore_sheet(open_form_sheet(SHEET_ID_form), dry_run=False)
+                reset_snapshots(SHEET_ID_form)
+            except Exception as e:
+                st.error(f"⚠️ Error applying rescore: {e}")
+        if "rescore_preview" in st.session_state:
+            report, diff = st.session_state.rescore_preview
+            st.json(report)
+            if not diff.empty:
+                st.dataframe(diff, use_container_width=True, hide_index=True)
 
 # ------------------------------
 # 📋 SUBMISSIONS TAB
 # ------------------------------
-with tab2:
+with tab2, perf.span("render.submissions"):
     st.subheader("All Submissions")
     col1, col2 = st.columns([2, 1])
     with col1:
@@ -179,25 +473,72 @@ with tab2:
             "Filter by Domain",
             sorted(df["Domain_Interest_Order"].dropna().astype(str).unique()) if "Domain_Interest_Order" in df.columns else []
         )
-        search = st.text_input("Search name or email")
+        search = st.text_input("Search (name, email, ID or any answer)")
     with col2:
         dept_filter = st.multiselect(
         "Filter by Department",
         sorted(df["Department"].dropna().astype(str).unique()) if "Department" in df.columns else []
     )
+        choice_filter = st.multiselect("Filter by First Choice", sorted(set(first_choice(df)) - {""}))
+        min_score = st.number_input("Minimum Total Score", min_value=0.0, value=0.0, step=1.0)
+    rank = st.checkbox("Rank by Total Score")
 
-    df_filtered = df.copy()
+    show_all = st.checkbox("Show all columns (downloads the full sheet)")
+    base = load_submissions(SHEET_ID_form)[0] if show_all else df
+    # every filter narrows one mask; rows are selected once at the end
+    keep = np.ones(len(base), dtype=bool)
     if domain_filter:
-        df_filtered = df_filtered[df_filtered["Domain_Interest_Order"].isin(domain_filter)]
-    if dept_filter:
-        df_filtered = df_filtered[df_filtered["Department"].isin(dept_filter)]
+        keep &= base["Domain_Interest_Order"].isin(domain_filter).to_numpy()
+    store = get_storage(SHEET_ID_form, SHEET_ID_Reviews)
+    ranked = None
+    if store.backend == "sqlite":
+        # department / first choice / score filters and the ranking run as one
+        # indexed query on the store; the frame only supplies the columns shown
+        with perf.span("submissions.ranking"):
+            ranked = store.ranking(choice_filter, dept_filter, min_score or None)
+        keep &= base.index.isin(ranked)
+    else:
+        if dept_filter:
+            keep &= base["Department"].isin(dept_filter).to_numpy()
+        if choice_filter:
+            keep &= first_choice(base).isin(choice_filter).to_numpy()
+        if min_score:
+            keep &= (base["Total_Score"] >= min_score).to_numpy()
     if search:
-        mask = (
-            df_filtered["Name"].astype(str).str.contains(search, case=False, na=False)
-            | df_filtered["Email"].astype(str).str.contains(search, case=False, na=False)
-        )
-        df_filtered = df_filtered[mask]
+        try:
+            keep &= base.index.isin(search_rows(SHEET_ID_form, search))
+        except Exception as e:
+            st.warning(f"⚠️ Search is unavailable right now: {e}")
+
+    with st.expander("🧩 Filter by answers"):
+        try:
+            codes = load_facets(SHEET_ID_form).reindex(base.index, fill_value=0)
+        except Exception as e:
+            st.warning(f"⚠️ Answer filters are unavailable right now: {e}")
+            codes = pd.DataFrame(index=base.index)
+        require_all = st.toggle("Match all selected options in a question (AND)", value=True)
+        # apply the current selections first so the counts reflect every filter
+        for column in codes.columns:
+            chosen = st.session_state.get(f"facet_{column}", [])
+            if chosen:
+                mask = option_mask(MULTISELECT_COLUMNS[column], chosen)
+                values = codes[column].to_numpy()
+                keep &= has_all(values, mask) if require_all else has_any(values, mask)
+        facet_cols = st.columns(3)
+        for i, column in enumerate(codes.columns):
+            options = MULTISELECT_COLUMNS[column]
+            counts = dict(zip(options, option_counts(codes[column].to_numpy()[keep], len(options)).tolist()))
+            facet_cols[i % 3].multiselect(
+                column.replace("_", " "), options, key=f"facet_{column}",
+                format_func=lambda opt, counts=counts: f"{opt} ({counts[opt]})",
+            )
 
+    df_filtered = base[keep]
+    if rank and ranked is not None:
+        df_filtered = df_filtered.loc[pd.Index(ranked).intersection(df_filtered.index, sort=False)]
+    elif rank:
+        df_filtered = df_filtered.sort_values("Total_Score", ascending=False, kind="stable")
+    st.caption(f"{len(df_filtered)} submission(s)")
     st.dataframe(df_filtered, use_container_width=True, height=500)
 
     if not df_filtered.empty:
@@ -207,18 +548,27 @@ with tab2:
 # ------------------------------
 # 📝 REVIEW TAB
 # ------------------------------
-with tab3:
+with tab3, perf.span("render.review"):
     st.subheader("Review and Add Notes")
 
-    candidate = st.selectbox("Select Candidate", options=df["Name"].unique() if "Name" in df.columns else [])
-    if candidate:
-        row = df[df["Name"] == candidate].iloc[0]
+    index = candidate_index(SHEET_ID_form, df_version, df)
+    query = st.text_input("🔎 Find candidate (name, email or Student ID)")
+    matches = index.search(query, limit=CANDIDATE_MATCHES)
+    if query.strip() and len(matches) == CANDIDATE_MATCHES:
+        st.caption(f"Showing the first {CANDIDATE_MATCHES} matches — type more to narrow it down.")
+    candidate_key = st.selectbox(
+        "Select Candidate", options=matches, format_func=index.label,
+    )
+    if candidate_key:
+        row = df.loc[index.row_number(candidate_key)]
+        candidate = row.get("Name", "")
 
         # --- Get existing data from form sheet ---
-        tech_score = float(row.get("Tech_Score", 0))
-        media_score = float(row.get("Media_Score", 0))
-        sponsor_score = float(row.get("Sponsor_Score", 0))
-        total_score = float(row.get("Total_Score", 0))
+        # scores are float32 in the shared frame; stored with 2 decimals
+        tech_score = round(float(row.get("Tech_Score", 0)), 2)
+        media_score = round(float(row.get("Media_Score", 0)), 2)
+        sponsor_score = round(float(row.get("Sponsor_Score", 0)), 2)
+        total_score = round(float(row.get("Total_Score", 0)), 2)
         final_score_of_domains = total_score * 3 + 2
         domain_order = row.get("Domain_Interest_Order", "N/A")
 
@@ -235,7 +585,7 @@ with tab3:
 
         if st.button("📄 View Full Candidate Info "):
             st.write("### Candidate Info")
-            st.json(row.to_dict())
+            st.json(load_candidate_row(SHEET_ID_form, int(row.name)))
         
         st.divider()
 
@@ -256,21 +606,12 @@ with tab3:
         col2.metric("💪 **Motivation**", motivation_score)
         col3.metric("✅ **Final Total**", round(computed_total, 2))
 
+        outbox, review_flusher = get_review_outbox(SHEET_ID_Reviews)
+        if "saved_reviews" not in st.session_state:
+            st.session_state.saved_reviews = []  # [(journal id, candidate, date)]
+
         if st.button("💾 Save Review"):
             try:
-                client = get_gspread_client()
-                try:
-                    review_sheet = client.open_by_key(SHEET_ID_Reviews).worksheet("Admin_Reviews")
-                except:
-                    # Create sheet if missing
-                    review_sheet = client.open_by_key(SHEET_ID_Reviews).add_worksheet("Admin_Reviews", rows=1000, cols=12)
-                    review_sheet.append_row([
-                        "Admin_Name", "Student_Name", "Tech_Score", "Media_Score",
-                        "Sponsor_Score", "Domain_Order", "Final_Score_of_Domains",
-                        "Motivation_Score", "Skills_Score", "Computed_Total",
-                        "Note", "Date"
-                    ])
-                
                 date_now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 review_data = [
                     admin_name, candidate, tech_score, media_score, sponsor_score,
@@ -278,9 +619,72 @@ with tab3:
                     computed_total, note, date_now
                 ]
 
-                review_sheet.append_row(review_data)
+                with perf.span("review.save"):
+                    review_id = outbox.append(review_data)
+                review_flusher.wake()
+                st.session_state.saved_reviews.append((review_id, candidate, date_now))
 
-                st.success(f"✅ Review saved successfully for {candidate}")
+                st.success(f"✅ Review saved for {candidate} (pending sync)")
 
             except Exception as e:
                 st.error(f"⚠️ Error saving review: {e}")
+
+        if st.session_state.saved_reviews:
+            st.markdown("### 🔄 Review Sync")
+            states = outbox.states(rid for rid, _, _ in st.session_state.saved_reviews)
+            st.dataframe(pd.DataFrame(
+                [(c, d, SYNC_LABELS.get(states.get(rid), "❔ unknown"))
+                 for rid, c, d in reversed(st.session_state.saved_reviews)],
+                columns=["Candidate", "Saved At", "Status"],
+            ), use_container_width=True, hide_index=True)
+            waiting = outbox.pending_count()
+            if review_flusher.last_error is not None:
+                st.warning(f"⚠️ {waiting} review(s) waiting — Google Sheets is unreachable, retrying. {review_flusher.last_error}")
+            elif waiting:
+                st.caption(f"{waiting} review(s) waiting to sync.")
+
+# ------------------------------
+# ⚙️ PERFORMANCE TAB
+# ------------------------------
+# Timings of this server process (all sessions), from the spans in perf.py.
+# The rerun is closed here so it is already in the tables below.
+perf.end_rerun()
+
+with tab4:
+    st.subheader("Performance")
+    app = st.selectbox("App", ["admin", "form", "background", "all"])
+    app = None if app == "all" else app
+
+    summary = perf.rerun_summary(app)
+    if summary:
+        c1, c2, c3, c4, c5 = st.columns(5)
+        c1.metric("Reruns", summary["count"])
+        c2.metric("p50", f"{summary['p50_ms']:.0f} ms")
+        c3.metric("p95", f"{summary['p95_ms']:.0f} ms")
+        c4.metric("p99", f"{summary['p99_ms']:.0f} ms")
+        c5.metric("API calls / rerun", round(summary["api_calls_mean"], 2))
+        st.markdown("#### API calls per rerun")
+        st.bar_chart(perf.rerun_table(app).set_index("rerun")["api_calls"])
+    else:
+        st.info("No completed reruns recorded yet.")
+
+    st.markdown("#### Spans (slowest p95 first)")
+    spans = perf.span_table(app)
+    if spans.empty:
+        st.caption("No spans recorded yet.")
+    else:
+        st.dataframe(spans, use_container_width=True)
+
+    st.markdown("#### Cache hit rates")
+    caches = perf.cache_table()
+    if caches.empty:
+        st.caption("No cached calls recorded yet.")
+    else:
+        st.dataframe(caches, use_container_width=True)
+
+    st.markdown("#### Google Sheets quota guard")
+    st.json({**GUARD.stats, "background_api_calls": perf.background_api_calls()})
+
+    if st.button("🧹 Reset measurements"):
+        perf.reset()
+        st.rerun()
@@ -1,11 +1,11 @@
 # admin_app/app.py
 import streamlit as st
-import pandas as pd
 import datetime
-import gspread
 import time
-import json
-from google.oauth2.service_account import Credentials
+from sheet_snapshot import SheetSnapshot
+from search_index import SearchIndex
+from schema import FORM_VERSION, check_header
+from storage import get_storage
 
 # ------------------------------
 # CONFIG
@@ -35,32 +35,12 @@ st.markdown("View submissions, filter, search and add notes.")
 SHEET_ID = "1wpyHQf51TxG7mUM6MikyGBsz9maN471y1sO03BPOEUo"
 # SHEET_ID = "1wpyHQf51TxG7mUM6MikyGBsz9maN471y1sO03BPOEUo" # itc sheet
 
-CANONICAL_HEADERS = [
-    "Name","Email","Department","Academic_Year","FB_Link","Discord_ID",
-    "Domain_Interest","Areas","Programming_Languages","Self_Rate","Portfolio",
-    "Tools","Domain_Extra","Why_Join","Motivation","Teamwork","Future_Goal",
-    "Free_Time","Active_Events","How_Know_Us","Other_Team","Role","Team_Leader",
-    "Extra","Score","Date"
-]
 
 # ------------------------------
-# GSpread helper
+# Sheet access (storage backend from config, see storage.py)
 # ------------------------------
-def get_gspread_client():
-    if "gcp_service_account" in st.secrets:
-        info = st.secrets["gcp_service_account"]
-        if isinstance(info, str):
-            info = json.loads(info)
-        creds = Credentials.from_service_account_info(info, scopes=["https://www.googleapis.com/auth/spreadsheets"])
-    else:
-        JSON_KEY_FILE = "last-f1197-42b004ea88d5 (1).json"
-        creds = Credentials.from_service_account_file(JSON_KEY_FILE, scopes=["https://www.googleapis.com/auth/spreadsheets"])
-    return gspread.authorize(creds)
-
-@st.cache_resource
 def open_sheet():
-    client = get_gspread_client()
-    return client.open_by_key(SHEET_ID).sheet1
+    return get_storage(form_sheet_id=SHEET_ID).table("submissions")
 
 try:
     sheet = open_sheet()
@@ -82,17 +62,32 @@ if pwd != ADMIN_PASSWORD:
 # ------------------------------
 # Read data
 # ------------------------------
+# one snapshot per process; each rerun only probes the sheet tail for changes
+@st.cache_resource
+def get_snapshot():
+    return SheetSnapshot(sheet)
+
+@st.cache_resource
+def get_search_index():
+    return SearchIndex()
+
 try:
-    raw = sheet.get_all_records()
-    df = pd.DataFrame(raw)
-    # ✅ Convert Score to numeric
-    if "Score" in df.columns:
-        df["Score"] = pd.to_numeric(df["Score"], errors="coerce").fillna(0)
+    snapshot = get_snapshot()
+    snapshot.sync()
+    # old (Score/Date) and current (Total_Score/Submission_Date) layouts both
+    # load under the current column names (see schema.typed_frame)
+    df = snapshot.frame()
 except Exception as e:
     st.error("Could not read data from Google Sheet.")
     st.exception(e)
     st.stop()
 
+layout_version, drift = check_header(snapshot.header)
+if layout_version is None:
+    st.warning(f"⚠️ The sheet header does not match a known layout: {drift}")
+elif layout_version != FORM_VERSION:
+    st.info(f"Sheet uses layout v{layout_version}; columns were mapped to v{FORM_VERSION} names.")
+
 st.write(f"Total submissions: {len(df)}")
 
 # ------------------------------
@@ -100,19 +95,20 @@ st.write(f"Total submissions: {len(df)}")
 # ------------------------------
 col1, col2 = st.columns([1, 2])
 with col1:
-    domain_filter = st.multiselect("Filter by domain", options=sorted(df["Domain_Interest"].dropna().unique()) if "Domain_Interest" in df.columns else [])
-    search = st.text_input("Search name or email")
+    domain_filter = st.multiselect("Filter by domain", options=sorted(df["Domain_Interest_Order"].dropna().unique()) if "Domain_Interest_Order" in df.columns else [])
+    search = st.text_input("Search (any column)")
 with col2:
-    st.metric("Average Score", round(df["Score"].mean(),2) if "Score" in df.columns and len(df) else "N/A")
-    if "Domain_Interest" in df.columns:
-        st.bar_chart(df["Domain_Interest"].value_counts())
+    st.metric("Average Score", round(float(df["Total_Score"].mean()),2) if "Total_Score" in df.columns and len(df) else "N/A")
+    if "Domain_Interest_Order" in df.columns:
+        st.bar_chart(df["Domain_Interest_Order"].value_counts())
 
 df_shown = df.copy()
 if domain_filter:
-    df_shown = df_shown[df_shown["Domain_Interest"].isin(domain_filter)]
+    df_shown = df_shown[df_shown["Domain_Interest_Order"].isin(domain_filter)]
 if search:
-    mask = (df_shown.get("Name","").astype(str).str.contains(search, case=False, na=False)) | (df_shown.get("Email","").astype(str).str.contains(search, case=False, na=False))
-    df_shown = df_shown[mask]
+    index = get_search_index()
+    index.sync(snapshot)
+    df_shown = df_shown[df_shown.index.isin(index.search(search))]
 
 st.dataframe(df_shown, use_container_width=True)
 
@@ -132,11 +128,7 @@ note_name = st.text_input("Applicant name (for note)")
 note_text = st.text_area("Note text")
 if st.button("Save Note"):
     try:
-        try:
-            notes_sheet = sheet.spreadsheet.worksheet("admin_notes")
-        except gspread.WorksheetNotFound:
-            notes_sheet = sheet.spreadsheet.add_worksheet(title="admin_notes", rows=1000, cols=5)
-            notes_sheet.update("A1", [["Name","Note","Date"]])
+        notes_sheet = get_storage(form_sheet_id=SHEET_ID).table("notes")
         notes_sheet.append_row([note_name, note_text, datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")])
         st.success("Note saved.")
     except Exception as e:
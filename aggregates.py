@@ -0,0 +1,135 @@
+# aggregates.py
+# Running dashboard aggregates, maintained as submissions are appended.
+#
+# Counts, score sums, per-dimension breakdowns (domain order, first-choice
+# domain, department, academic year) and score histograms are folded in one
+# row at a time, so keeping them current costs O(1) per new submission instead
+# of a pass over the whole frame on every rerun. sync(snapshot) folds in only
+# the rows appended since the last sync and starts over after a full reload
+# (the same rule as search_index). The state is saved as JSON next to the
+# snapshot's Parquet file and reused on restart when it matches that copy.
+import os
+import json
+import threading
+
+DIMENSIONS = ["Domain_Interest_Order", "First_Choice", "Department", "Academic_Year"]
+SCORE_COLUMN = "Total_Score"
+HISTOGRAM_BIN = 5  # width of a Total_Score bucket
+
+
+def _score(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def first_choice(domain_order):
+    return str(domain_order).split(",")[0].strip()
+
+
+class Aggregates:
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self.clear()
+        if path and os.path.exists(path):
+            try:
+                self.load()
+            except (OSError, ValueError, KeyError):
+                self.clear()
+
+    def clear(self):
+        self.count = 0
+        self.score_sum = 0.0
+        self.groups = {dim: {} for dim in DIMENSIONS}     # dim -> value -> [count, score sum]
+        self.histograms = {}                              # first choice -> bucket -> count
+        self.rows_seen = 0
+        self.loaded_at = None  # snapshot.loaded_at these totals were built from
+
+    # ------------------------------
+    # Updates
+    # ------------------------------
+    def add(self, record):
+        """Fold one submission (a mapping of column -> value) into the totals."""
+        score = _score(record.get(SCORE_COLUMN, 0))
+        values = {
+            "Domain_Interest_Order": record.get("Domain_Interest_Order", ""),
+            "First_Choice": first_choice(record.get("Domain_Interest_Order", "")),
+            "Department": record.get("Department", ""),
+            "Academic_Year": record.get("Academic_Year", ""),
+        }
+        self.count += 1
+        self.score_sum += score
+        for dim, value in values.items():
+            slot = self.groups[dim].setdefault(str(value), [0, 0.0])
+            slot[0] += 1
+            slot[1] += score
+        bucket = str(int(score // HISTOGRAM_BIN) * HISTOGRAM_BIN)
+        hist = self.histograms.setdefault(values["First_Choice"], {})
+        hist[bucket] = hist.get(bucket, 0) + 1
+
+    def sync(self, snapshot):
+        """Catch up with a SheetSnapshot. Returns the number of rows folded in."""
+        with snapshot._lock:
+            header, rows, loaded_at = snapshot.header, snapshot.rows, snapshot.loaded_at
+        with self._lock:
+            if loaded_at != self.loaded_at or len(rows) < self.rows_seen:
+                self.clear()
+                self.loaded_at = loaded_at
+            new_rows = rows[self.rows_seen:]
+            for row in new_rows:
+                self.add(dict(zip(header, row)))
+            self.rows_seen = len(rows)
+            if new_rows and self.path:
+                self.save()
+        return len(new_rows)
+
+    # ------------------------------
+    # Reads
+    # ------------------------------
+    @property
+    def mean_score(self):
+        return self.score_sum / self.count if self.count else 0.0
+
+    def distinct(self, dim):
+        return len(self.groups[dim])
+
+    def counts(self, dim):
+        """{value: count}, largest first."""
+        return dict(sorted(((v, c) for v, (c, _) in self.groups[dim].items()), key=lambda x: -x[1]))
+
+    def means(self, dim):
+        return {v: s / c for v, (c, s) in self.groups[dim].items() if c}
+
+    def histogram(self, choice=None):
+        """{bucket start: count}, for one first-choice domain or all of them."""
+        hists = [self.histograms.get(choice, {})] if choice else list(self.histograms.values())
+        merged = {}
+        for hist in hists:
+            for bucket, n in hist.items():
+                merged[int(bucket)] = merged.get(int(bucket), 0) + n
+        return dict(sorted(merged.items()))
+
+    # ------------------------------
+    # Persistence
+    # ------------------------------
+    def save(self):
+        state = {
+            "count": self.count, "score_sum": self.score_sum, "groups": self.groups,
+            "histograms": self.histograms, "rows_seen": self.rows_seen, "loaded_at": self.loaded_at,
+        }
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def load(self):
+        with open(self.path, encoding="utf-8") as f:
+            state = json.load(f)
+        self.count = state["count"]
+        self.score_sum = state["score_sum"]
+        self.groups = {dim: state["groups"].get(dim, {}) for dim in DIMENSIONS}
+        self.histograms = state["histograms"]
+        self.rows_seen = state["rows_seen"]
+        self.loaded_at = state["loaded_at"]
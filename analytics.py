@@ -0,0 +1,91 @@
+# analytics.py
+# Pre-aggregated applicant breakdowns for the dashboard's drill-down charts.
+#
+# build_cube() runs the group-bys once per data snapshot; the charts only slice
+# the small result tables (a few hundred rows), never the applicant frame:
+#   cube        first choice x department x academic year -> count, score sums
+#   scores      first choice x Total_Score bucket -> count
+#   popularity  question x option x department x year -> count, over
+#               applicants whose first choice is Tech (from the bitset codes)
+import numpy as np
+import pandas as pd
+
+from aggregates import HISTOGRAM_BIN
+from form_options import MULTISELECT_COLUMNS
+
+CUBE_DIMENSIONS = ["First_Choice", "Department", "Academic_Year"]
+SCORE_FIELDS = ["Tech_Score", "Media_Score", "Sponsor_Score", "Total_Score"]
+POPULARITY_COLUMNS = ["Tech_Programming_Languages", "Tech_Tools"]
+
+
+def first_choice(frame):
+    """First domain of each applicant's Domain_Interest_Order ("" if missing)."""
+    order = frame["Domain_Interest_Order"].astype(str) if "Domain_Interest_Order" in frame.columns \
+        else pd.Series("", index=frame.index)
+    return order.str.split(",").str[0].str.strip().fillna("")
+
+
+def _dimensions(frame):
+    return pd.DataFrame({
+        "First_Choice": first_choice(frame),
+        "Department": frame["Department"].astype(str) if "Department" in frame.columns else "",
+        "Academic_Year": frame["Academic_Year"].astype(str) if "Academic_Year" in frame.columns else "",
+    }, index=frame.index)
+
+
+def build_cube(frame, codes=None):
+    """Dict of small long-format tables (see module comment)."""
+    dims = _dimensions(frame)
+    scores = pd.DataFrame({
+        f: frame[f].astype(float) if f in frame.columns else 0.0 for f in SCORE_FIELDS
+    }, index=frame.index)
+
+    data = pd.concat([dims, scores], axis=1)
+    grouped = data.groupby(CUBE_DIMENSIONS, sort=False)
+    cube = grouped[SCORE_FIELDS].sum().add_suffix("_sum")
+    cube.insert(0, "count", grouped.size())
+    cube = cube.reset_index()
+
+    bucket = (scores["Total_Score"] // HISTOGRAM_BIN * HISTOGRAM_BIN).astype(int)
+    score_dist = (
+        pd.DataFrame({"First_Choice": dims["First_Choice"], "Bucket": bucket})
+        .groupby(["First_Choice", "Bucket"]).size().rename("count").reset_index()
+    )
+
+    parts = []
+    if codes is not None:
+        tech = (dims["First_Choice"] == "Tech").to_numpy()
+        tech_dims = dims.loc[tech, ["Department", "Academic_Year"]].reset_index(drop=True)
+        for column in POPULARITY_COLUMNS:
+            if column not in codes.columns:
+                continue
+            options = MULTISELECT_COLUMNS[column]
+            values = codes[column].reindex(frame.index, fill_value=0).to_numpy()[tech]
+            bits = (values[:, None] >> np.arange(len(options), dtype=np.uint64)) & np.uint64(1)
+            chosen = pd.DataFrame(bits.astype(np.int64), columns=options)
+            counts = pd.concat([tech_dims, chosen], axis=1).groupby(["Department", "Academic_Year"]).sum()
+            long = counts.stack().rename("count").reset_index()
+            long.columns = ["Department", "Academic_Year", "Option", "count"]
+            long.insert(0, "Question", column)
+            parts.append(long[long["count"] > 0])
+    popularity = pd.concat(parts, ignore_index=True) if parts else \
+        pd.DataFrame(columns=["Question", "Department", "Academic_Year", "Option", "count"])
+
+    return {"cube": cube, "scores": score_dist, "popularity": popularity}
+
+
+def slice_table(table, **filters):
+    """Rows of a cube table matching the given dimension values (None = all)."""
+    mask = np.ones(len(table), dtype=bool)
+    for dim, value in filters.items():
+        if value is not None:
+            mask &= (table[dim] == value).to_numpy()
+    return table[mask]
+
+
+def rollup(cube, by):
+    """Count and mean scores per value of one dimension, from a (sliced) cube."""
+    totals = cube.groupby(by)[["count"] + [f"{f}_sum" for f in SCORE_FIELDS]].sum()
+    means = totals[[f"{f}_sum" for f in SCORE_FIELDS]].div(totals["count"].where(totals["count"] > 0), axis=0)
+    means.columns = [f"Avg_{f}" for f in SCORE_FIELDS]
+    return pd.concat([totals[["count"]], means.round(2)], axis=1).sort_values("count", ascending=False)
@@ -0,0 +1,376 @@
+# benchmark.py
+# Offline benchmarks for the form and the admin dashboard, against fake_sheets.
+#
+# For each sheet size (1k / 10k / 100k submissions by default) a fresh fake
+# service is seeded with generated applicants (fake_applicants.py) and we time:
+#   submit      the form's submit path, stage by stage: duplicate check,
+#               scoring + row build, reservation + journal write (together,
+#               what the applicant waits for), then the flusher's batched
+#               append_rows to the sheet, throttled by the shared QuotaGuard
+#   admin       admin_dash.py through Streamlit's AppTest: first render after
+#               login, warm reruns, search and filter reruns, and the first
+#               render of a second session once the shared caches are warm
+#   components  search index queries and bitmask facet filters on their own
+#   memory      tracemalloc peak while rendering the first and second session
+#
+# Results go to a JSON file; --compare OLD.json prints the p50 ratios against
+# an earlier run and exits 1 if any got slower than --threshold.
+#
+# Usage: python benchmark.py --sizes 1000 10000 --out bench.json
+#        python benchmark.py --latency 0.15 --jitter 0.1 --compare bench.json
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import datetime
+import platform
+import subprocess
+import tempfile
+import tracemalloc
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+WORK_DIR = tempfile.mkdtemp(prefix="itc-bench-")
+# journal.py reads its path at import time; keep every local file out of the repo
+os.environ["ITC_JOURNAL_PATH"] = os.path.join(WORK_DIR, "journal.db")
+os.environ["ITC_STORAGE"] = "sheets"
+
+import numpy as np  # noqa: E402
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import storage  # noqa: E402
+import sheets_client  # noqa: E402
+from fake_sheets import FakeSheetsService  # noqa: E402
+from fake_applicants import random_applicant, submission_row, sheet_values  # noqa: E402
+from schema import CANONICAL_HEADERS, REVIEW_HEADERS  # noqa: E402
+from journal import Journal, Flusher, JOURNAL_PATH, normalize_key  # noqa: E402
+from email_index import EmailIndex  # noqa: E402
+from reservations import ReservationLedger, reservation_keys  # noqa: E402
+from search_index import SearchIndex  # noqa: E402
+from sheet_snapshot import SheetSnapshot  # noqa: E402
+from bitsets import encode_frame, option_mask, has_all  # noqa: E402
+from form_options import MULTISELECT_COLUMNS  # noqa: E402
+
+ADMIN_APP = os.path.join(APP_DIR, "admin_dash.py")
+ADMIN_PASSWORD = "bench"
+SEARCH_QUERIES = ["python", "sécurité", "applicant12", "benali", "@etu", "ctf", "zzzz-no-match"]
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+def percentiles(samples):
+    """Milliseconds summary of a list of durations in seconds."""
+    if not samples:
+        return {"n": 0}
+    ms = np.asarray(samples) * 1000
+    return {
+        "n": len(ms), "mean": round(float(ms.mean()), 3),
+        "p50": round(float(np.percentile(ms, 50)), 3), "p95": round(float(np.percentile(ms, 95)), 3),
+        "p99": round(float(np.percentile(ms, 99)), 3), "max": round(float(ms.max()), 3),
+    }
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def fresh_service(n, args):
+    """A fake service holding an n-row form sheet, wired into sheets_client."""
+    service = FakeSheetsService(latency=args.latency, jitter=args.jitter, error_429=args.error_429,
+                                error_5xx=args.error_5xx, seed=args.seed)
+    service.create(storage.FORM_SHEET_ID, tabs={"Sheet1": sheet_values(n, seed=args.seed)})
+    service.create(storage.REVIEWS_SHEET_ID, tabs={"Sheet1": [], "Admin_Reviews": [REVIEW_HEADERS]})
+    sheets_client.use_client(service)
+    # a cold process: no cached storage, snapshots, indexes or frames
+    storage._storages.clear()
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    return service
+
+
+# ------------------------------
+# Submit path (user_form.py)
+# ------------------------------
+def bench_submit(n, args):
+    service = fresh_service(n, args)
+    sheet = storage.get_storage(storage.FORM_SHEET_ID).table("submissions")
+    _, header_time = timed(sheet.row_values, 1)
+
+    index = EmailIndex(sheet, CANONICAL_HEADERS.index("Email"), CANONICAL_HEADERS.index("Student_ID"))
+    _, index_time = timed(index.refresh)
+    journal = Journal(JOURNAL_PATH, f"bench_submissions_{n}", key_cols=[CANONICAL_HEADERS.index("Email")])
+    ledger = ReservationLedger(os.path.join(WORK_DIR, f"reservations-{n}.db"))
+    flusher = Flusher(journal, sheet, value_input_option="USER_ENTERED")  # flushed inline, not started
+
+    rng = random.Random(args.seed + n)
+    stages = {"dup_check": [], "score_and_build": [], "store": [], "end_to_end": []}
+    rejected = 0
+    service.reset_stats()
+    for i in range(args.submissions):
+        # every 10th applicant reuses an email already in the sheet
+        email = f"applicant{rng.randrange(n)}@etu.example.dz" if i % 10 == 9 else None
+        answers = random_applicant(rng, n + i, email=email)
+
+        start = time.perf_counter()
+        duplicate = index.contains(answers["email"], answers["student_id"]) or \
+            journal.has_key(normalize_key([answers["email"]]))
+        checked = time.perf_counter()
+        if duplicate:
+            rejected += 1
+            stages["dup_check"].append(checked - start)
+            continue
+        row = submission_row(answers)
+        built = time.perf_counter()
+        keys = reservation_keys(answers["email"], answers["student_id"])
+        if not ledger.reserve(keys):
+            rejected += 1
+            continue
+        journal.append(row)
+        index.add(answers["email"], answers["student_id"])
+        stored = time.perf_counter()
+
+        stages["dup_check"].append(checked - start)
+        stages["score_and_build"].append(built - checked)
+        stages["store"].append(stored - built)
+        stages["end_to_end"].append(stored - start)
+
+    # what the background flusher then does with the accepted rows
+    flushes, flushed = [], 0
+    drain_start = time.perf_counter()
+    while True:
+        count, elapsed = timed(flusher.flush_once)
+        if not count:
+            break
+        flushes.append(elapsed)
+        flushed += count
+    drain = time.perf_counter() - drain_start
+
+    return {
+        "ensure_headers_ms": round(header_time * 1000, 3),
+        "email_index_load_ms": round(index_time * 1000, 3),
+        "submissions": args.submissions,
+        "duplicates_rejected": rejected,
+        "api_calls": dict(service.calls),
+        **{name: percentiles(samples) for name, samples in stages.items()},
+        "flush_batch": percentiles(flushes),
+        "rows_flushed": flushed,
+        "flush_rows_per_s": round(flushed / drain, 1) if drain else None,
+    }
+
+
+# ------------------------------
+# Admin dashboard (admin_dash.py)
+# ------------------------------
+def login(at):
+    at.run()
+    at.text_input[0].input("bench")
+    at.text_input[1].input(ADMIN_PASSWORD)
+
+
+def widget(widgets, label):
+    return next(w for w in widgets if w.label.startswith(label))
+
+
+def run_app(at):
+    start = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f"admin_dash raised: {at.exception[0].value}")
+    return elapsed
+
+
+def bench_admin(n, args):
+    service = fresh_service(n, args)
+    size_dir = os.path.join(WORK_DIR, f"admin-{n}")
+    os.makedirs(size_dir, exist_ok=True)
+    for name in os.listdir(APP_DIR):
+        if name.endswith((".png", ".jpg")):
+            shutil.copy(os.path.join(APP_DIR, name), size_dir)
+    cwd = os.getcwd()
+    os.chdir(size_dir)  # snapshot Parquet files and aggregates land here
+    try:
+        at = AppTest.from_file(ADMIN_APP, default_timeout=args.timeout)
+        at.secrets["admin_password"] = ADMIN_PASSWORD
+        login(at)
+        service.reset_stats()
+        tracemalloc.start()
+        first_render = run_app(at)
+        _, first_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        first_calls = dict(service.calls)
+
+        reruns = [run_app(at) for _ in range(args.reruns)]
+
+        search = widget(at.text_input, "Search")
+        search_runs = []
+        for query in SEARCH_QUERIES:
+            search.input(query)
+            search_runs.append(run_app(at))
+        search.input("")
+
+        dept = widget(at.multiselect, "Filter by Department")
+        filter_runs = []
+        for option in dept.options[:5]:
+            dept.set_value([option])
+            filter_runs.append(run_app(at))
+        dept.set_value([])
+
+        second = AppTest.from_file(ADMIN_APP, default_timeout=args.timeout)
+        second.secrets["admin_password"] = ADMIN_PASSWORD
+        login(second)
+        tracemalloc.start()
+        second_render = run_app(second)
+        _, second_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        os.chdir(cwd)
+
+    return {
+        "first_render_ms": round(first_render * 1000, 3),
+        "first_render_api_calls": first_calls,
+        "rerun": percentiles(reruns),
+        "search_rerun": percentiles(search_runs),
+        "filter_rerun": percentiles(filter_runs),
+        "second_session_first_render_ms": round(second_render * 1000, 3),
+        "peak_memory_mb": {
+            "first_session": round(first_peak / 2 ** 20, 2),
+            "second_session": round(second_peak / 2 ** 20, 2),
+        },
+    }
+
+
+# ------------------------------
+# Components
+# ------------------------------
+def bench_components(n, args):
+    fresh_service(n, args)
+    sheet = storage.get_storage(storage.FORM_SHEET_ID).table("submissions")
+    snapshot = SheetSnapshot(sheet)
+    _, load_time = timed(snapshot.full_reload)
+    frame, frame_time = timed(snapshot.frame)
+
+    index = SearchIndex()
+    _, index_time = timed(index.sync, snapshot)
+    queries = [timed(index.search, q)[1] for q in SEARCH_QUERIES for _ in range(5)]
+
+    codes, encode_time = timed(encode_frame, frame)
+    languages = MULTISELECT_COLUMNS["Tech_Programming_Languages"]
+    mask = option_mask(languages, languages[:2])
+    column = codes["Tech_Programming_Languages"].to_numpy()
+    filters = [timed(has_all, column, mask)[1] for _ in range(50)]
+
+    return {
+        "snapshot_load_ms": round(load_time * 1000, 3),
+        "frame_build_ms": round(frame_time * 1000, 3),
+        "search_index_build_ms": round(index_time * 1000, 3),
+        "search_query": percentiles(queries),
+        "facet_encode_ms": round(encode_time * 1000, 3),
+        "facet_filter": percentiles(filters),
+    }
+
+
+# ------------------------------
+# Report
+# ------------------------------
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def p50s(results, prefix=""):
+    """Flatten {"...": {"p50": x}} and "*_ms" leaves into {path: milliseconds}."""
+    out = {}
+    for key, value in results.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            if "p50" in value:
+                out[path] = value["p50"]
+            else:
+                out.update(p50s(value, f"{path}."))
+        elif key.endswith("_ms"):
+            out[path] = value
+    return out
+
+
+def compare(old, new, threshold, min_ms=1.0):
+    """Print p50 ratios new/old; returns the metrics slower than 1 + threshold.
+
+    Metrics under min_ms in the old run are printed but never flagged (noise).
+    """
+    before, after = p50s(old["results"]), p50s(new["results"])
+    slower = []
+    for path in sorted(after):
+        if path in before and before[path] > 0:
+            ratio = after[path] / before[path]
+            flag = "  <-- slower" if ratio > 1 + threshold and before[path] >= min_ms else ""
+            print(f"{path:60s} {before[path]:10.2f} -> {after[path]:10.2f} ms  x{ratio:.2f}{flag}")
+            if flag:
+                slower.append(path)
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks against fake_sheets.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--only", choices=["submit", "admin", "components"], nargs="+",
+                        default=["submit", "admin", "components"])
+    parser.add_argument("--out", default="benchmark.json")
+    parser.add_argument("--submissions", type=int, default=200, help="submits timed per size")
+    parser.add_argument("--reruns", type=int, default=10, help="warm admin reruns timed per size")
+    parser.add_argument("--latency", type=float, default=0.0, help="fake API latency per call (s)")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-429", type=float, default=0.0)
+    parser.add_argument("--error-5xx", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=600, help="AppTest script timeout (s)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed p50 slowdown for --compare")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="ignore --compare metrics faster than this")
+    args = parser.parse_args(argv)
+
+    # retries against injected faults should not stretch the run
+    sheets_client.GUARD.base_delay = 0.05
+    benches = {"submit": bench_submit, "admin": bench_admin, "components": bench_components}
+    report = {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "streamlit": st.__version__,
+            "fake": {"latency": args.latency, "jitter": args.jitter,
+                     "error_429": args.error_429, "error_5xx": args.error_5xx, "seed": args.seed},
+        },
+        "results": {},
+    }
+    try:
+        for n in args.sizes:
+            result = report["results"][str(n)] = {}
+            for name in args.only:
+                print(f"[{n} rows] {name}...", file=sys.stderr)
+                result[name] = benches[name](n, args)
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"wrote {args.out}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            old = json.load(f)
+        if compare(old, report, args.threshold, args.min_ms):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
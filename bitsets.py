@@ -0,0 +1,64 @@
+# bitsets.py
+# Multi-select answers as integer bitmasks.
+#
+# The form stores a multiselect as ", ".join(choices). Each such column is
+# decoded once per snapshot into one uint64 per row, bit i set when option i
+# (in the order of the form's option list) was chosen. Filters and counts are
+# then plain NumPy bitwise operations over the whole column:
+#   knows Python AND Git  ->  (codes & mask) == mask
+#   any of them           ->  (codes & mask) != 0
+import numpy as np
+import pandas as pd
+
+from form_options import MULTISELECT_COLUMNS
+from scoring import option_matrix
+
+MAX_OPTIONS = 64
+
+
+def encode_column(series, options):
+    """uint64 bitmask per row for one multi-select column."""
+    if len(options) > MAX_OPTIONS:
+        raise ValueError(f"{len(options)} options do not fit in a 64-bit mask")
+    # decode each distinct answer once, then gather to every row
+    codes, uniques = pd.factorize(series.fillna("").astype(str))
+    decoded = option_matrix(pd.Series(uniques, dtype=object), options).to_numpy()
+    shifts = np.arange(len(options), dtype=np.uint64)
+    # distinct bits, so the sum is the bitwise OR
+    masks = (decoded.astype(np.uint64) << shifts).sum(axis=1, dtype=np.uint64)
+    return masks[codes]
+
+
+def encode_frame(df, columns=None):
+    """DataFrame of bitmask columns (same index as df) for every multi-select column present."""
+    columns = MULTISELECT_COLUMNS if columns is None else columns
+    return pd.DataFrame(
+        {name: encode_column(df[name], options) for name, options in columns.items() if name in df.columns},
+        index=df.index,
+    )
+
+
+def option_mask(options, selected):
+    mask = 0
+    for opt in selected:
+        mask |= 1 << list(options).index(opt)
+    return np.uint64(mask)
+
+
+def has_all(codes, mask):
+    return (codes & mask) == mask
+
+
+def has_any(codes, mask):
+    return (codes & mask) != 0
+
+
+def option_counts(codes, n_options):
+    """How many rows chose each option."""
+    codes = np.asarray(codes, dtype=np.uint64)
+    shifts = np.arange(n_options, dtype=np.uint64)
+    return ((codes[:, None] >> shifts) & np.uint64(1)).sum(axis=0)
+
+
+def decode(code, options):
+    return [opt for i, opt in enumerate(options) if int(code) >> i & 1]
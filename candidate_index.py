@@ -0,0 +1,93 @@
+# candidate_index.py
+# Applicant lookup keyed by a stable ID instead of the display name.
+#
+# Every row gets a key: its normalized email, or its Student_ID when the email
+# is blank. Two people with the same name are two entries, and selecting one is
+# a dict lookup (key -> sheet row number) instead of a scan over the frame.
+#
+# Type-ahead: every word of the name, the email and the Student_ID goes into
+# one sorted list of (term, key). A query is answered by bisecting to its first
+# word's prefix range and filtering those few candidates by the remaining
+# words, so it stays fast with thousands of applicants.
+import bisect
+import threading
+
+
+def _norm(value):
+    return str(value).strip().lower()
+
+
+def applicant_key(email, student_id="", row_number=None):
+    email, student_id = _norm(email), _norm(student_id)
+    if email:
+        return email
+    if student_id:
+        return f"sid:{student_id}"
+    return f"row:{row_number}"
+
+
+class CandidateIndex:
+    def __init__(self, frame=None):
+        self.rows = {}    # key -> sheet row number
+        self.labels = {}  # key -> "Name — email"
+        self._text = {}   # key -> lowercased name/email/ID, for multi-word queries
+        self._terms = []  # sorted [(term, key)]
+        self._lock = threading.Lock()
+        if frame is not None:
+            self.add_frame(frame)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, key):
+        return key in self.rows
+
+    def add_frame(self, frame):
+        """Index the rows of a snapshot frame (index = sheet row number)."""
+        names = frame["Name"] if "Name" in frame.columns else [""] * len(frame)
+        emails = frame["Email"] if "Email" in frame.columns else [""] * len(frame)
+        ids = frame["Student_ID"] if "Student_ID" in frame.columns else [""] * len(frame)
+        terms = []
+        with self._lock:
+            for row_number, name, email, student_id in zip(frame.index, names, emails, ids):
+                key = applicant_key(email, student_id, row_number)
+                name, email, student_id = str(name).strip(), str(email).strip(), str(student_id).strip()
+                label = f"{name} — {email or student_id or f'row {row_number}'}"
+                if key in self.rows:
+                    # duplicate submission: keep both, the later one gets a suffix
+                    key = f"{key}#{row_number}"
+                    label = f"{label} (row {row_number})"
+                self.rows[key] = int(row_number)
+                self.labels[key] = label
+                words = _norm(name).split() + [_norm(email), _norm(student_id)]
+                self._text[key] = " ".join(words)
+                terms.extend((w, key) for w in set(words) if w)
+            if terms:
+                self._terms = sorted(self._terms + terms)
+
+    def row_number(self, key):
+        return self.rows.get(key)
+
+    def label(self, key):
+        return self.labels.get(key, key)
+
+    def search(self, query, limit=50):
+        """Keys whose name words / email / ID start with the query's words, in sheet order.
+
+        An empty query lists every candidate; `limit` caps the matches of a real query.
+        """
+        words = _norm(query).split()
+        if not words:
+            return sorted(self.rows, key=self.rows.get)
+        first, rest = words[0], words[1:]
+        with self._lock:
+            start = bisect.bisect_left(self._terms, (first,))
+            hits = set()
+            for term, key in self._terms[start:]:
+                if not term.startswith(first):
+                    break
+                hits.add(key)
+            text = self._text
+            if rest:
+                hits = {k for k in hits if all(w in text[k] for w in rest)}
+        return sorted(hits, key=self.rows.get)[:limit]
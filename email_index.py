@@ -0,0 +1,74 @@
+# email_index.py
+# Process-wide index of the Email and Student_ID columns of the form sheet.
+#
+# Loaded once (only those two columns), updated locally after every accepted
+# submission, and refreshed in the background by fetching only the rows past
+# the last row we have seen. Duplicate checks at submit time are pure set
+# lookups and never touch the network.
+import time
+import threading
+
+from journal import col_letter
+
+
+def _norm(value):
+    return str(value).strip().lower()
+
+
+class EmailIndex:
+    def __init__(self, sheet, email_col, student_id_col):
+        self.sheet = sheet
+        self.email_col = col_letter(email_col)
+        self.student_id_col = col_letter(student_id_col)
+        self.emails = set()
+        self.student_ids = set()
+        self.last_row = 1  # header row
+        self._lock = threading.Lock()
+
+    def _fetch_after(self, row):
+        start = row + 1
+        emails, ids = self.sheet.batch_get([
+            f"{self.email_col}{start}:{self.email_col}",
+            f"{self.student_id_col}{start}:{self.student_id_col}",
+        ])
+        return [r[0] if r else "" for r in emails], [r[0] if r else "" for r in ids]
+
+    def refresh(self):
+        """Pull rows appended since the last refresh. Returns how many were read."""
+        with self._lock:
+            start = self.last_row
+        emails, ids = self._fetch_after(start)
+        height = max(len(emails), len(ids))
+        with self._lock:
+            if self.last_row != start:  # another refresh won the race
+                return 0
+            self.emails.update(_norm(e) for e in emails if str(e).strip())
+            self.student_ids.update(_norm(i) for i in ids if str(i).strip())
+            self.last_row = start + height
+        return height
+
+    def add(self, email, student_id=""):
+        with self._lock:
+            if str(email).strip():
+                self.emails.add(_norm(email))
+            if str(student_id).strip():
+                self.student_ids.add(_norm(student_id))
+
+    def contains(self, email, student_id=""):
+        with self._lock:
+            if _norm(email) in self.emails:
+                return True
+            return bool(str(student_id).strip()) and _norm(student_id) in self.student_ids
+
+
+def start_refresher(index, interval=30.0):
+    """Keep the index in step with rows written by other processes."""
+    def loop():
+        while True:
+            time.sleep(interval)
+            try:
+                index.refresh()
+            except Exception:
+                pass  # next tick retries; submits keep using what we have
+
+    threading.Thread(target=loop, name="email-index-refresh", daemon=True).start()
@@ -0,0 +1,121 @@
+# fake_applicants.py
+# Randomized applicants for benchmarks and load tests.
+#
+# random_applicant() draws one set of answers from the form's own option lists
+# (form_options.py), in the same shape user_form.py hands to score_applicant();
+# submission_row() turns it into the sheet row the form would append, scores
+# included. Seeded, so a run can be reproduced.
+import random
+import datetime
+
+from schema import CANONICAL_HEADERS
+from scoring import score_applicant, normalize_domain_order
+from form_options import (
+    TECH_AREAS, TECH_LANGUAGES, TECH_PROJECTS, TECH_TOOLS,
+    MEDIA_AREAS, MEDIA_TOOLS, MEDIA_FREELANCE, MEDIA_TASKS, MEDIA_EDITING_TOOLS,
+    MEDIA_EQUIPMENT, MEDIA_PROJECTS,
+    SPONSOR_AREAS, SPONSOR_EXPERIENCE, SPONSOR_EVENT_PARTICIPATION, SPONSOR_CONNECTIONS,
+    SPONSOR_PUBLIC_SPEAKING, SPONSOR_REPRESENT_CLUB,
+)
+
+DEPARTMENTS = ["MI", "ST", "SM", "SNV", "GC", "GE"]
+ACADEMIC_YEARS = ["L1/ING1", "L2/ING2", "L3/ING3", "M1/ING4", "M2/ING5"]
+DOMAINS = ["Tech", "Media", "Sponsor"]  # the form's own choices
+FIRST_NAMES = ["Amine", "Sara", "Yacine", "Lina", "Rayan", "Ines", "Walid", "Meriem", "Anis", "Nour", "Hélène", "Chérif"]
+LAST_NAMES = ["Benali", "Haddad", "Mansouri", "Zerrouki", "Kaci", "Bouzid", "Saidi", "Belkacem", "Amrani", "Rahmani"]
+WHY_JOIN = [
+    "I love coding and want to build real projects",
+    "J'aime la sécurité informatique et les CTF",
+    "To meet people and organize events",
+    "Design and video editing are my passion",
+    "I want to improve my communication skills",
+]
+
+
+def _pick(rng, options):
+    return rng.sample(options, rng.randint(0, len(options)))
+
+
+def random_applicant(rng, i=0, email=None):
+    """One applicant's answers; `email` overrides the generated one (duplicates)."""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return {
+        "name": f"{first} {last} {i}",
+        "email": email or f"applicant{i}@etu.example.dz",
+        "phone": f"0{rng.choice('567')}{rng.randint(10000000, 99999999)}",
+        "student_id": f"{2020 + rng.randint(0, 5)}{i:06d}",
+        "department": rng.choice(DEPARTMENTS),
+        "academic_year": rng.choice(ACADEMIC_YEARS),
+        "fb_link": f"https://facebook.com/{first.lower()}.{last.lower()}.{i}",
+        "discord_id": f"{first.lower()}#{rng.randint(1000, 9999)}",
+        "date_birth": f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(2000, 2007)}",
+        "domain_order": rng.sample(DOMAINS, 3),
+        "tech": {
+            "areas": _pick(rng, TECH_AREAS), "languages": _pick(rng, TECH_LANGUAGES),
+            "project_desc": _pick(rng, TECH_PROJECTS), "portfolio": rng.choice(["yes", "no"]),
+            "tools": _pick(rng, TECH_TOOLS), "self_rate": rng.randint(0, 5),
+        },
+        "media": {
+            "areas": _pick(rng, MEDIA_AREAS), "tools": _pick(rng, MEDIA_TOOLS),
+            "freelance_exp": rng.choice(MEDIA_FREELANCE), "media_tasks": _pick(rng, MEDIA_TASKS),
+            "editing_tools": _pick(rng, MEDIA_EDITING_TOOLS), "deep_tools": _pick(rng, MEDIA_EQUIPMENT),
+            "portfolio": rng.choice(["yes", "no"]), "project_desc": _pick(rng, MEDIA_PROJECTS),
+            "designrate": rng.randint(0, 5), "editingrate": rng.randint(0, 5),
+        },
+        "sponsor": {
+            "areas": _pick(rng, SPONSOR_AREAS), "exp_desc": _pick(rng, SPONSOR_EXPERIENCE),
+            "event_participation": rng.choice(SPONSOR_EVENT_PARTICIPATION),
+            "connections": rng.choice(SPONSOR_CONNECTIONS),
+            "public_speaking": rng.choice(SPONSOR_PUBLIC_SPEAKING),
+            "represent_club": rng.choice(SPONSOR_REPRESENT_CLUB), "comm_rate": rng.randint(0, 5),
+        },
+        "why_join": rng.choice(WHY_JOIN),
+        "what_learn": rng.choice(["Python", "Leadership", "Montage vidéo", "Public speaking"]),
+        "other_club": rng.choice(["No", "Yes"]),
+        "leadership": rng.choice(["Yes, I’m interested", "Maybe later", "Not for now"]),
+        "challenge": "Split the work and met every evening before the deadline",
+        "manage_time": rng.choice(["A weekly planner", "Weekends only", "After classes"]),
+        "communication_skills": rng.randint(0, 5),
+        "public_speaking": rng.choice(["Comfortable", "A bit shy", "Very comfortable"]),
+        "anything_to_add": "",
+    }
+
+
+def submission_row(answers, submitted_at=None):
+    """The row user_form.py appends for these answers, in CANONICAL_HEADERS order."""
+    order = normalize_domain_order(answers["domain_order"])
+    tech, media, sponsor = answers["tech"], answers["media"], answers["sponsor"]
+    scores, total = score_applicant(order, tech, media, sponsor)
+    j = ", ".join
+    submitted_at = submitted_at or datetime.datetime.now()
+    row = [
+        answers["name"], answers["email"], answers["phone"], answers["student_id"],
+        answers["department"], answers["academic_year"], answers["fb_link"],
+        answers["discord_id"], answers["date_birth"],
+        j(order),
+        j(tech["areas"]), j(tech["languages"]), j(tech["project_desc"]), tech["portfolio"],
+        j(tech["tools"]), tech["self_rate"], scores["Tech"],
+        j(media["areas"]), j(media["tools"]), media["freelance_exp"], j(media["media_tasks"]),
+        j(media["editing_tools"]), j(media["deep_tools"]), media["portfolio"], j(media["project_desc"]),
+        media["designrate"], media["editingrate"], scores["Media"],
+        j(sponsor["areas"]), j(sponsor["exp_desc"]), sponsor["event_participation"],
+        sponsor["connections"], sponsor["public_speaking"], sponsor["represent_club"],
+        sponsor["comm_rate"], scores["Sponsoring"],
+        answers["why_join"], answers["what_learn"], answers["other_club"], answers["leadership"],
+        answers["challenge"], answers["manage_time"], answers["communication_skills"],
+        answers["public_speaking"], answers["anything_to_add"],
+        total,
+        submitted_at.strftime("%Y-%m-%d %H:%M:%S"),
+    ]
+    return row
+
+
+def sheet_values(n, seed=0):
+    """Header plus n submission rows, as a fake sheet's initial values."""
+    rng = random.Random(seed)
+    start = datetime.datetime(2025, 10, 1, 9, 0)
+    rows = [
+        [str(v) for v in submission_row(random_applicant(rng, i), start + datetime.timedelta(seconds=20 * i))]
+        for i in range(n)
+    ]
+    return [list(CANONICAL_HEADERS)] + rows
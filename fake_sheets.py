@@ -0,0 +1,352 @@
+# fake_sheets.py
+# In-process stand-in for the Google Sheets API, for load tests and benchmarks.
+#
+# FakeSheetsService plays the part of an authorized gspread client and hands
+# out spreadsheets / worksheets with the calls the apps make (open_by_key,
+# sheet1, worksheet, add_worksheet, get / get_values / get_all_values,
+# get_all_records, batch_get, row_values, col_values, update, batch_update,
+# append_row(s)). Cells are kept in memory as strings, the way Sheets returns
+# formatted values.
+#
+# Every API call can be made to behave like welcome day:
+#   latency / jitter     seconds slept per call (latency + uniform(0, jitter))
+#   error_429            probability a call fails with 429 RESOURCE_EXHAUSTED
+#   error_5xx            probability a call fails with a transient 503
+#   error_applied        probability a write is applied and then fails anyway
+#                        (a 503 or a read timeout), so the caller cannot tell
+#                        whether it landed
+#   reads_per_minute     server-side quota per 60 s window (None = unlimited);
+#   writes_per_minute    calls over it get a 429, like the real per-user quota
+#   inject(status, n)    fail the next n calls with that status (deterministic);
+#                        applied=True fails the next n writes after applying them,
+#                        status "timeout" raises requests.ReadTimeout
+# Failures are real gspread APIErrors (or requests timeouts), so QuotaGuard
+# retries them exactly as it would the real thing.
+#
+# Usage: service = FakeSheetsService(latency=0.15, error_429=0.02, seed=1)
+#        sheets_client.use_client(service)    # every open_worksheet() now hits it
+# There is deliberately no environment switch: the fake is only ever installed
+# by code that imports it (benchmark.py, load_test.py), never by a running app.
+import time
+import random
+import threading
+from collections import Counter, deque
+
+import requests
+from gspread.exceptions import APIError, WorksheetNotFound, SpreadsheetNotFound
+from gspread.utils import a1_range_to_grid_range, numericise_all, to_records
+
+DEFAULT_ROWS = 1000
+DEFAULT_COLS = 26
+STATUS_NAMES = {
+    400: "INVALID_ARGUMENT", 404: "NOT_FOUND", 429: "RESOURCE_EXHAUSTED",
+    500: "INTERNAL", 502: "BAD_GATEWAY", 503: "UNAVAILABLE", 504: "DEADLINE_EXCEEDED",
+}
+READ_CALLS = {
+    "open_by_key", "sheet1", "worksheet", "worksheets", "get", "get_values", "get_all_values",
+    "get_all_records", "batch_get", "row_values", "col_values",
+}
+
+
+class _Response:
+    """Just enough of requests.Response for APIError and QuotaGuard."""
+
+    def __init__(self, status_code, message, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = message
+        self._error = {"code": status_code, "message": message, "status": STATUS_NAMES.get(status_code, "UNKNOWN")}
+
+    def json(self):
+        return {"error": self._error}
+
+
+def api_error(status_code, message=None, retry_after=None):
+    headers = {"Retry-After": str(retry_after)} if retry_after is not None else {}
+    return APIError(_Response(status_code, message or STATUS_NAMES.get(status_code, "error"), headers))
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    return str(value)
+
+
+def _trim(values):
+    values = list(values)
+    while values and values[-1] == "":
+        values.pop()
+    return values
+
+
+def _raise(status, write):
+    if status == "timeout":
+        raise requests.ReadTimeout("Read timed out. (fake_sheets)")
+    if status == 429:
+        raise api_error(429, f"Quota exceeded for quota metric '{'Write' if write else 'Read'} requests'")
+    raise api_error(status, "The service is currently unavailable.")
+
+
+class FakeSheetsService:
+    def __init__(self, latency=0.0, jitter=0.0, error_429=0.0, error_5xx=0.0, error_applied=0.0,
+                 reads_per_minute=None, writes_per_minute=None, seed=None, auto_create=True):
+        self.spreadsheets = {}
+        self.auto_create = auto_create
+        self.calls = Counter()     # method -> calls that reached the service
+        self.errors = Counter()    # status -> injected failures ("503 applied" after a write)
+        self._random = random.Random(seed)
+        self._injected = deque()
+        self._injected_applied = deque()
+        self._windows = {False: deque(), True: deque()}  # write? -> call times in the last 60 s
+        self._lock = threading.RLock()
+        self.configure(latency=latency, jitter=jitter, error_429=error_429, error_5xx=error_5xx,
+                       error_applied=error_applied, reads_per_minute=reads_per_minute,
+                       writes_per_minute=writes_per_minute)
+
+    def configure(self, **faults):
+        """Change latency / error rates / quotas, e.g. halfway through a load test."""
+        for name, value in faults.items():
+            if name not in ("latency", "jitter", "error_429", "error_5xx", "error_applied",
+                            "reads_per_minute", "writes_per_minute"):
+                raise TypeError(f"unknown fault setting: {name}")
+            setattr(self, name, value)
+
+    def inject(self, status, count=1, applied=False):
+        """Fail the next `count` API calls with `status` (an HTTP status or
+        "timeout"); with applied=True, the next `count` writes after applying them."""
+        with self._lock:
+            (self._injected_applied if applied else self._injected).extend([status] * count)
+
+    def reset_stats(self):
+        with self._lock:
+            self.calls.clear()
+            self.errors.clear()
+
+    # ------------------------------
+    # Fault injection
+    # ------------------------------
+    def _over_quota(self, write, now):
+        limit = self.writes_per_minute if write else self.reads_per_minute
+        window = self._windows[write]
+        while window and now - window[0] >= 60:
+            window.popleft()
+        if limit is not None and len(window) >= limit:
+            return True
+        window.append(now)
+        return False
+
+    def _request(self, method, apply=None):
+        """Account for one API call: sleep, then maybe fail it. Writes pass the
+        mutation as `apply`; it runs here, and may still be reported as failed."""
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            time.sleep(delay)
+        write = method not in READ_CALLS
+        with self._lock:
+            self.calls[method] += 1
+            status = None
+            if self._injected:
+                status = self._injected.popleft()
+            elif self._over_quota(write, time.monotonic()):
+                status = 429
+            elif self._random.random() < self.error_429:
+                status = 429
+            elif self._random.random() < self.error_5xx:
+                status = 503
+            if status is not None:
+                self.errors[status] += 1
+        if status is not None:
+            _raise(status, write)
+        if apply is None:
+            return None
+        result = apply()
+        with self._lock:
+            status = None
+            if self._injected_applied:
+                status = self._injected_applied.popleft()
+            elif self._random.random() < self.error_applied:
+                status = self._random.choice([503, "timeout"])
+            if status is not None:
+                self.errors[f"{status} applied"] += 1
+        if status is not None:
+            _raise(status, write)
+        return result
+
+    # ------------------------------
+    # Client surface
+    # ------------------------------
+    def create(self, key, title=None, tabs=None):
+        """New spreadsheet; tabs is {title: values} (default: one empty "Sheet1")."""
+        with self._lock:
+            spreadsheet = self.spreadsheets[key] = FakeSpreadsheet(self, key, title or key)
+            for tab, values in (tabs or {"Sheet1": []}).items():
+                width = max([DEFAULT_COLS] + [len(row) for row in values])
+                worksheet = spreadsheet._add(tab, max(DEFAULT_ROWS, len(values)), width)
+                worksheet.rows = [[_cell(v) for v in row] for row in values]
+            return spreadsheet
+
+    def open_by_key(self, key):
+        self._request("open_by_key")
+        with self._lock:
+            spreadsheet = self.spreadsheets.get(key)
+            if spreadsheet is None:
+                if not self.auto_create:
+                    raise SpreadsheetNotFound(key)
+                spreadsheet = self.create(key)
+            return spreadsheet
+
+
+class FakeSpreadsheet:
+    def __init__(self, service, key, title):
+        self.service = service
+        self.id = key
+        self.title = title
+        self._worksheets = []
+
+    def _add(self, title, rows, cols):
+        worksheet = FakeWorksheet(self, len(self._worksheets), title, rows, cols)
+        self._worksheets.append(worksheet)
+        return worksheet
+
+    @property
+    def sheet1(self):
+        self.service._request("sheet1")
+        return self._worksheets[0]
+
+    def worksheets(self):
+        self.service._request("worksheets")
+        return list(self._worksheets)
+
+    def worksheet(self, title):
+        self.service._request("worksheet")
+        for worksheet in self._worksheets:
+            if worksheet.title == title:
+                return worksheet
+        raise WorksheetNotFound(title)
+
+    def add_worksheet(self, title, rows=DEFAULT_ROWS, cols=DEFAULT_COLS, index=None):
+        def apply():
+            with self.service._lock:
+                if any(ws.title == title for ws in self._worksheets):
+                    raise api_error(400, f'A sheet with the name "{title}" already exists.')
+                return self._add(title, int(rows), int(cols))
+        return self.service._request("add_worksheet", apply)
+
+
+class FakeWorksheet:
+    """One tab: a list of rows of strings, row 1 first."""
+
+    def __init__(self, spreadsheet, sheet_id, title, rows, cols):
+        self.spreadsheet = spreadsheet
+        self.spreadsheet_id = spreadsheet.id
+        self.id = sheet_id
+        self.title = title
+        self.row_count = rows
+        self.col_count = cols
+        self.rows = []
+
+    def _request(self, method, apply=None):
+        return self.spreadsheet.service._request(method, apply)
+
+    def _grid(self, range_name=None):
+        grid = a1_range_to_grid_range(range_name) if range_name else {}
+        r0, r1 = grid.get("startRowIndex", 0), grid.get("endRowIndex")
+        c0, c1 = grid.get("startColumnIndex", 0), grid.get("endColumnIndex")
+        with self.spreadsheet.service._lock:
+            out = [_trim(row[c0:c1]) for row in self.rows[r0:r1]]
+        while out and not out[-1]:
+            out.pop()
+        return out
+
+    # --- reads ---
+    def get(self, range_name=None, **kwargs):
+        self._request("get")
+        return self._grid(range_name)
+
+    def get_values(self, range_name=None, **kwargs):
+        self._request("get_values")
+        return self._grid(range_name)
+
+    def get_all_values(self, **kwargs):
+        self._request("get_all_values")
+        return self._grid()
+
+    def get_all_records(self, head=1, default_blank="", numericise_ignore=(), empty2zero=False, **kwargs):
+        self._request("get_all_records")
+        values = self._grid()
+        if len(values) < head:
+            return []
+        keys = values[head - 1]
+        width = len(keys)
+        rows = [(r + [""] * width)[:width] for r in values[head:]]
+        if list(numericise_ignore) != ["all"]:
+            rows = [numericise_all(r, empty2zero, default_blank, False, list(numericise_ignore)) for r in rows]
+        return to_records(keys, rows)
+
+    def batch_get(self, ranges, **kwargs):
+        self._request("batch_get")
+        return [self._grid(r) for r in ranges]
+
+    def row_values(self, row, **kwargs):
+        self._request("row_values")
+        rows = self._grid(f"{row}:{row}")
+        return rows[0] if rows else []
+
+    def col_values(self, col, **kwargs):
+        self._request("col_values")
+        with self.spreadsheet.service._lock:
+            return _trim(row[col - 1] if col <= len(row) else "" for row in self.rows)
+
+    # --- writes ---
+    def _write(self, range_name, values):
+        grid = a1_range_to_grid_range(range_name)
+        r0, c0 = grid.get("startRowIndex", 0), grid.get("startColumnIndex", 0)
+        width = max((len(v) for v in values), default=0)
+        if r0 + len(values) > self.row_count or c0 + width > self.col_count:
+            raise api_error(400, f"Range ({self.title}!{range_name}) exceeds grid limits. "
+                                 f"Max rows: {self.row_count}, max columns: {self.col_count}")
+        for offset, new in enumerate(values):
+            while len(self.rows) <= r0 + offset:
+                self.rows.append([])
+            row = self.rows[r0 + offset]
+            row += [""] * (c0 + len(new) - len(row))
+            row[c0:c0 + len(new)] = [_cell(v) for v in new]
+        return {"updatedRange": f"{self.title}!{range_name}", "updatedRows": len(values)}
+
+    def update(self, *args, **kwargs):
+        # update(values, range_name), or the older update(range_name, values)
+        values, range_name = kwargs.get("values"), kwargs.get("range_name")
+        for arg in args:
+            if isinstance(arg, str):
+                range_name = arg
+            else:
+                values = arg
+        def apply():
+            with self.spreadsheet.service._lock:
+                return self._write(range_name or "A1", values)
+        return self._request("update", apply)
+
+    def batch_update(self, data, **kwargs):
+        def apply():
+            with self.spreadsheet.service._lock:
+                return [self._write(item["range"], item["values"]) for item in data]
+        return self._request("batch_update", apply)
+
+    def _append(self, values):
+        with self.spreadsheet.service._lock:
+            while self.rows and not any(self.rows[-1]):
+                self.rows.pop()
+            first = len(self.rows) + 1
+            self.rows.extend([_cell(v) for v in row] for row in values)
+            # appending past the last row grows the grid, as Sheets does
+            self.row_count = max(self.row_count, len(self.rows))
+            self.col_count = max([self.col_count] + [len(r) for r in values])
+        return {"updates": {"updatedRange": f"{self.title}!A{first}", "updatedRows": len(values)}}
+
+    def append_rows(self, values, value_input_option=None, **kwargs):
+        return self._request("append_rows", lambda: self._append(values))
+
+    def append_row(self, values, value_input_option=None, **kwargs):
+        return self._request("append_row", lambda: self._append([values]))
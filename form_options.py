@@ -0,0 +1,197 @@
+# form_options.py
+# Answer options of the application form, shared by the form (user_form.py)
+# and everything that reads submissions back (scoring, filters, ...).
+# Multi-select answers are stored in the sheet as ", ".join(selected).
+
+# ------------------------------
+# Tech domain
+# ------------------------------
+TECH_AREAS = [
+    "Robotics",
+    "AI/ML",
+    "Security",
+    "Front-End",
+    "Back-End",
+    "Mobile",
+    "Game Dev",
+    "UI/UX",
+]
+
+TECH_LANGUAGES = [
+    "Python",
+    "C/C++",
+    "Java",
+    "JavaScript /TypeScript",
+    "C#",
+    "Dart (Flutter)",
+    "PHP",
+    "SQL",
+    "None yet, but I’m learning",
+]
+
+TECH_PROJECTS = [
+    "Participated in national or international competitions",
+    "Designed (alone or in a team) the UI/UX of an app or website",
+    "Built a fully functional robot",
+    "Developed a responsive website",
+    "Trained an AI model",
+    "Created a game",
+    "Modeled or implemented a security system",
+    "Developed a fully functional mobile application",
+    "Created an original project or innovative solution",
+    "Modified or improved existing ideas or systems",
+    "Conduct practical experiments or hands-on technical tests occasionally",
+    "Not yet, but excited to start",
+]
+
+TECH_TOOLS = [
+    "Arduino / ESP32 / Raspberry Pi /sensors",
+    "Unity",
+    "Figma",
+    "Java",
+    "Git/GitHub",
+    "Linux",
+    "Database(SQL / MongoDB)",
+    "Docker/VM",
+    "VS Code / IntelliJ / PyCharm",
+    "APIs / Postman",
+    "Cloud Services (AWS, Firebase, etc.)",
+    "Flutter",
+    "No, but I’d like to try",
+]
+
+
+# ------------------------------
+# Design & media domain
+# ------------------------------
+MEDIA_AREAS = [
+    "Graphic Design",
+    "UI UX",
+    "Illustration",
+    "Motion Graphics",
+    "3D Modeling",
+]
+
+MEDIA_TOOLS = [
+    "Adobe Illustrator",
+    "Photoshop",
+    "Figma",
+    "Canva",
+    "InDesign",
+    "Other",
+    "None, but I’d like to learn",
+]
+
+MEDIA_FREELANCE = [
+    "Yes",
+    "No",
+    "Not yet, but I’d like to",
+]
+
+MEDIA_TASKS = [
+    "Photography",
+    "Videography",
+    "Video Editing",
+    "Script / Caption Writing",
+    "Social Media Management",
+    "Voice Recording / Narration",
+    "Acting",
+]
+
+MEDIA_EDITING_TOOLS = [
+    "Adobe Premiere Pro",
+    "CapCut",
+    "DaVinci Resolve",
+    "Adobe Audition",
+    "Audacity",
+    "None",
+]
+
+MEDIA_EQUIPMENT = [
+    "Camera",
+    "Smartphone with good camera",
+    "Microphone",
+    "Lighting Setup",
+    "Tripod / Stabilizer",
+    "SD cards / External storage",
+    "None",
+]
+
+MEDIA_PROJECTS = [
+    # -1 items
+    "Participated in a design competition -1",
+    "Tried taking professional photos -1",
+    "Managed media coverage or promotional content -1",
+    "Tried or currently doing content creation -1",
+    # -2 items
+    "Created a complete project (poster, logo, UI/UX, 3D model, etc.) -2",
+    "Designed for real events, clients, or organizations -2",
+    "Created a short film or video project -2",
+    "Made a marketing strategy / understand social media algorithms -2",
+    "Good at voice acting or acting -2",
+]
+
+
+# ------------------------------
+# Sponsoring domain
+# ------------------------------
+SPONSOR_AREAS = [
+    "Searching for sponsors",
+    "Writing emails",
+    "Negotiation & Partnerships",
+    "Marketing and promotion",
+    "Communication and network",
+    "Other",
+]
+
+SPONSOR_EXPERIENCE = [
+    "Contacting or negotiating with sponsors",
+    "Writing partnership proposals",
+    "Managing event logistics (venue, materials, setup…)",
+    "Communicating with partners or companies",
+    "Handling budgets or sponsorship funds",
+    "None",
+]
+
+SPONSOR_EVENT_PARTICIPATION = [
+    "Yes, many times",
+    "Yes, once or twice",
+    "No, but I'd like to learn",
+]
+
+SPONSOR_CONNECTIONS = [
+    "Yes",
+    "Maybe",
+    "No",
+]
+
+SPONSOR_PUBLIC_SPEAKING = [
+    "Yes, confidently",
+    "Sometimes",
+    "Not really, but I’d like to get better",
+    "No, I prefer working behind the scenes",
+]
+
+SPONSOR_REPRESENT_CLUB = [
+    "Yes, definitely",
+    "Maybe",
+    "Not really",
+]
+
+# ------------------------------
+# Sheet column -> options, for every multi-select question
+# ------------------------------
+MULTISELECT_COLUMNS = {
+    "Tech_Areas": TECH_AREAS,
+    "Tech_Programming_Languages": TECH_LANGUAGES,
+    "Tech_Project_Desc": TECH_PROJECTS,
+    "Tech_Tools": TECH_TOOLS,
+    "Media_Areas": MEDIA_AREAS,
+    "Media_Tools": MEDIA_TOOLS,
+    "Media_Tasks": MEDIA_TASKS,
+    "Media_Editing_Tools": MEDIA_EDITING_TOOLS,
+    "Media_Equipment": MEDIA_EQUIPMENT,
+    "Media_Project_Desc": MEDIA_PROJECTS,
+    "Sponsor_Areas": SPONSOR_AREAS,
+    "Sponsor_Exp_Desc": SPONSOR_EXPERIENCE,
+}
@@ -0,0 +1,261 @@
+# journal.py
+# Append-only local journal for rows headed to a Google Sheet.
+#
+# Rows are written to SQLite (WAL mode) first, so the caller gets control back
+# in milliseconds. A background Flusher pushes pending rows to the sheet in
+# batches with one `append_rows` call (a single values.append request) per batch.
+#
+# Exactly-once replay: a batch is "claimed" (state = inflight) before it is sent
+# and marked "flushed" after the sheet confirms it. If the process dies or the
+# request fails in between, the next flush reconciles inflight rows against the
+# key columns already in the sheet: rows found there are marked flushed, the
+# others go back to pending. While a batch is being sent its claim is refreshed
+# every few seconds (a heartbeat), so a send stuck in quota waits or retries is
+# never taken for an abandoned one and sent a second time by another process.
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+import contextlib
+
+from gspread.utils import rowcol_to_a1
+
+JOURNAL_PATH = os.environ.get("ITC_JOURNAL_PATH", "itc_journal.db")
+
+PENDING = "pending"
+INFLIGHT = "inflight"
+FLUSHED = "flushed"
+
+# an inflight batch owned by another process is considered abandoned after this
+STALE_CLAIM_SECONDS = 120
+# how often a batch being sent refreshes its claim
+HEARTBEAT_SECONDS = STALE_CLAIM_SECONDS / 8
+
+
+def col_letter(index):
+    """0-based column index -> A1 column letter."""
+    return rowcol_to_a1(1, index + 1).rstrip("0123456789")
+
+
+def normalize_key(values):
+    return "|".join(str(v).strip().lower() for v in values)
+
+
+class Journal:
+    def __init__(self, path, name, key_cols):
+        self.path = path
+        self.name = name
+        self.key_cols = list(key_cols)
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.name} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                row_key TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT '{PENDING}',
+                owner TEXT,
+                claimed_at REAL,
+                created_at REAL NOT NULL,
+                flushed_at REAL
+            )
+        """)
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {self.name}_state ON {self.name}(state, id)")
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {self.name}_key ON {self.name}(row_key)")
+
+    def row_key(self, row):
+        return normalize_key(row[i] if i < len(row) else "" for i in self.key_cols)
+
+    # ------------------------------
+    # Writers
+    # ------------------------------
+    def append(self, row):
+        """Durably record one row and return its journal id."""
+        with self._lock:
+            cur = self._conn.execute(
+                f"INSERT INTO {self.name} (row_key, payload, created_at) VALUES (?, ?, ?)",
+                (self.row_key(row), json.dumps(row, ensure_ascii=False), time.time()),
+            )
+            return cur.lastrowid
+
+    def claim(self, limit):
+        """Move up to `limit` pending rows to inflight and return [(id, row)]."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    f"SELECT id, payload FROM {self.name} WHERE state = ? ORDER BY id LIMIT ?",
+                    (PENDING, limit),
+                ).fetchall()
+                if rows:
+                    self._conn.executemany(
+                        f"UPDATE {self.name} SET state = ?, owner = ?, claimed_at = ? WHERE id = ?",
+                        [(INFLIGHT, self.owner, time.time(), r[0]) for r in rows],
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [(r[0], json.loads(r[1])) for r in rows]
+
+    def touch(self, ids):
+        """Refresh this process's claim on inflight rows."""
+        with self._lock:
+            self._conn.executemany(
+                f"UPDATE {self.name} SET claimed_at = ? WHERE id = ? AND state = ? AND owner = ?",
+                [(time.time(), i, INFLIGHT, self.owner) for i in ids],
+            )
+
+    @contextlib.contextmanager
+    def holding(self, ids, every=HEARTBEAT_SECONDS):
+        """Keep the claim on `ids` fresh while the block runs."""
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(every):
+                self.touch(ids)
+
+        self.touch(ids)
+        heartbeat = threading.Thread(target=beat, name=f"claim-{self.name}", daemon=True)
+        heartbeat.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            heartbeat.join()
+
+    def mark_flushed(self, ids):
+        self._set_state(ids, FLUSHED, flushed_at=time.time())
+
+    def release(self, ids):
+        self._set_state(ids, PENDING)
+
+    def _set_state(self, ids, state, flushed_at=None):
+        if not ids:
+            return
+        with self._lock:
+            self._conn.executemany(
+                f"UPDATE {self.name} SET state = ?, owner = NULL, claimed_at = NULL, flushed_at = ? WHERE id = ?",
+                [(state, flushed_at, i) for i in ids],
+            )
+
+    # ------------------------------
+    # Readers
+    # ------------------------------
+    def inflight(self):
+        """Inflight rows this process owns, plus abandoned claims from dead processes."""
+        stale = time.time() - STALE_CLAIM_SECONDS
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, row_key FROM {self.name} WHERE state = ? AND (owner = ? OR claimed_at < ?) ORDER BY id",
+                (INFLIGHT, self.owner, stale),
+            ).fetchall()
+        return rows
+
+    def has_key(self, key):
+        """True if an unflushed row with this key is waiting in the journal."""
+        with self._lock:
+            hit = self._conn.execute(
+                f"SELECT 1 FROM {self.name} WHERE row_key = ? AND state != ? LIMIT 1",
+                (key, FLUSHED),
+            ).fetchone()
+        return hit is not None
+
+    def states(self, ids):
+        """{id: state} for the given journal ids, so a UI can show what has synced."""
+        ids = list(ids)
+        if not ids:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, state FROM {self.name} WHERE id IN ({','.join('?' * len(ids))})", ids
+            ).fetchall()
+        return dict(rows)
+
+    def pending_count(self):
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT COUNT(*) FROM {self.name} WHERE state != ?", (FLUSHED,)
+            ).fetchone()[0]
+
+
+# ------------------------------
+# Background flusher
+# ------------------------------
+class Flusher(threading.Thread):
+    def __init__(self, journal, sheet, batch_size=100, interval=2.0, max_backoff=60.0,
+                 value_input_option="USER_ENTERED"):
+        super().__init__(name=f"flusher-{journal.name}", daemon=True)
+        self.journal = journal
+        # a worksheet, or a zero-arg callable that opens one on the first flush,
+        # so rows can be queued while the sheet is still unreachable
+        self._sheet = sheet
+        self.value_input_option = value_input_option
+        self.batch_size = batch_size
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self.last_error = None
+        self._wake = threading.Event()
+
+    @property
+    def sheet(self):
+        if callable(self._sheet):
+            self._sheet = self._sheet()
+        return self._sheet
+
+    def wake(self):
+        self._wake.set()
+
+    def reconcile(self):
+        """Settle inflight rows left by a failed request or a crashed process."""
+        inflight = self.journal.inflight()
+        if not inflight:
+            return
+        ranges = [f"{col_letter(c)}:{col_letter(c)}" for c in self.journal.key_cols]
+        columns = self.sheet.batch_get(ranges)
+        cols = [[r[0] if r else "" for r in col] for col in columns]
+        height = max((len(c) for c in cols), default=0)
+        in_sheet = {
+            normalize_key(c[i] if i < len(c) else "" for c in cols)
+            for i in range(height)
+        }
+        done = [i for i, key in inflight if key in in_sheet]
+        self.journal.mark_flushed(done)
+        self.journal.release([i for i, key in inflight if key not in in_sheet])
+
+    def flush_once(self):
+        self.reconcile()
+        batch = self.journal.claim(self.batch_size)
+        if not batch:
+            return 0
+        ids = [i for i, _ in batch]
+        # the send may sit in QuotaGuard's bucket waits and 429 retries for a while
+        with self.journal.holding(ids):
+            self.sheet.append_rows([row for _, row in batch], value_input_option=self.value_input_option)
+        self.journal.mark_flushed(ids)
+        return len(batch)
+
+    def run(self):
+        delay = self.interval
+        while True:
+            try:
+                while self.flush_once() == self.batch_size:
+                    pass
+                self.last_error = None
+                delay = self.interval
+            except Exception as e:
+                self.last_error = e
+                delay = min(delay * 2, self.max_backoff)
+            self._wake.wait(delay)
+            self._wake.clear()
+
+
+def start_flusher(journal, sheet, **kwargs):
+    flusher = Flusher(journal, sheet, **kwargs)
+    flusher.start()
+    return flusher
@@ -0,0 +1,338 @@
+# load_test.py
+# Welcome-day load test: many applicants submitting user_form.py at once.
+#
+# Each simulated applicant is a Streamlit AppTest session of the real form:
+# it loads the page, fills every widget with randomized answers
+# (fake_applicants.py) and clicks "Submit". AppTest keeps its runtime in
+# process-global state, so concurrent sessions run in separate worker
+# processes -- like several server processes behind one URL. The workers share
+# the submission journal and the reservation ledger (SQLite files); each one
+# talks to its own fake_sheets service seeded with the same sheet, with
+# configurable latency / 429 / 5xx, and the rows they end up appending are
+# merged as the sheet's final contents. Quota windows are per worker.
+# --error-applied makes writes land and then fail anyway (503 or timeout): the
+# case where a blind retry appends the same rows twice.
+#
+# Some applicants deliberately reuse an email: half of them one already in the
+# sheet, half one used by another applicant moments earlier (so both race).
+# After the run the flushers are drained and we check that every email was
+# accepted exactly once (never, if it was already in the sheet) and that the
+# sheet holds no duplicate rows.
+#
+# Reported: throughput, p50/p95/p99 page-load and submit latency, API calls per
+# accepted submission, and duplicate-detection correctness. Exit status is 1
+# if a duplicate check was wrong, a session raised, or rows were left unflushed.
+#
+# Usage: python load_test.py --applicants 200 --concurrency 8 --latency 0.15 --error-429 0.02
+#        python load_test.py --error-applied 0.2     # no key may reach the sheet twice
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import multiprocessing
+from queue import Empty
+from collections import Counter
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+# shared with the worker processes, which import this module again
+WORK_DIR = os.environ.get("ITC_LOAD_WORK_DIR") or tempfile.mkdtemp(prefix="itc-load-")
+os.environ["ITC_LOAD_WORK_DIR"] = WORK_DIR
+# journal.py reads its path at import time; keep every local file out of the repo
+os.environ["ITC_JOURNAL_PATH"] = os.path.join(WORK_DIR, "journal.db")
+os.environ["ITC_STORAGE"] = "sheets"
+
+import numpy as np  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import storage  # noqa: E402
+import sheets_client  # noqa: E402
+from fake_sheets import FakeSheetsService  # noqa: E402
+from fake_applicants import random_applicant, sheet_values  # noqa: E402
+from schema import CANONICAL_HEADERS  # noqa: E402
+from journal import Journal, JOURNAL_PATH  # noqa: E402
+
+FORM_APP = os.path.join(APP_DIR, "user_form.py")
+EMAIL_COLUMN = CANONICAL_HEADERS.index("Email") + 1
+
+# (widget kind, label fragment, answer path) for every form field
+FIELDS = [
+    ("text_input", "Full Name", "name"),
+    ("text_input", "Email Address", "email"),
+    ("text_input", "Phone Number", "phone"),
+    ("text_input", "Department", "department"),
+    ("text_input", "Student ID", "student_id"),
+    ("text_input", "Facebook Link", "fb_link"),
+    ("text_input", "Discord ID", "discord_id"),
+    ("text_input", "Date of Birth", "date_birth"),
+    ("selectbox", "Academic Year", "academic_year"),
+    ("multiselect", "Which areas interest you", "tech.areas"),
+    ("multiselect", "Programming languages", "tech.languages"),
+    ("multiselect", "Describe a project / competition", "tech.project_desc"),
+    ("selectbox", "Do you have a portfolio?", "tech.portfolio"),
+    ("multiselect", "Tools", "tech.tools"),
+    ("slider", "Rate yourself", "tech.self_rate"),
+    ("multiselect", "Which design areas", "media.areas"),
+    ("multiselect", "Which tools or software", "media.tools"),
+    ("selectbox", "worked as a freelancer", "media.freelance_exp"),
+    ("multiselect", "media tasks", "media.media_tasks"),
+    ("multiselect", "tools do you use for editing", "media.editing_tools"),
+    ("multiselect", "explored or owned", "media.deep_tools"),
+    ("selectbox", "Do you have a portfolio ?", "media.portfolio"),
+    ("multiselect", "media-related project", "media.project_desc"),
+    ("slider", "Rate experience", "media.designrate"),
+    ("slider", "Rate your editing skills", "media.editingrate"),
+    ("multiselect", "type of activities", "sponsor.areas"),
+    ("multiselect", "prior experience", "sponsor.exp_desc"),
+    ("selectbox", "organizing an event", "sponsor.event_participation"),
+    ("selectbox", "connections", "sponsor.connections"),
+    ("selectbox", "speaking or presenting", "sponsor.public_speaking"),
+    ("selectbox", "representing the club", "sponsor.represent_club"),
+    ("slider", "confidence in communication", "sponsor.comm_rate"),
+    ("text_area", "Why do you want to join", "why_join"),
+    ("text_area", "hope to learn", "what_learn"),
+    ("selectbox", "other clubs", "other_club"),
+    ("selectbox", "leadership responsibilities", "leadership"),
+    ("text_area", "challenge you faced", "challenge"),
+    ("text_input", "manage your time", "manage_time"),
+    ("slider", "communication skills", "communication_skills"),
+    ("text_input", "public speaking", "public_speaking"),
+    ("text_area", "Anything else", "anything_to_add"),
+]
+DOMAIN_KEYS = ["first_domain", "second_domain", "third_domain"]
+
+
+def percentiles(samples):
+    """Milliseconds p50/p95/p99 of a list of durations in seconds."""
+    if not samples:
+        return {"n": 0}
+    ms = np.asarray(samples) * 1000
+    return {"n": len(ms), **{f"p{q}": round(float(np.percentile(ms, q)), 1) for q in (50, 95, 99)},
+            "max": round(float(ms.max()), 1)}
+
+
+def answer(answers, path):
+    value = answers
+    for part in path.split("."):
+        value = value[part]
+    return value
+
+
+def fill_form(at, answers):
+    for kind, fragment, path in FIELDS:
+        widget = next(w for w in getattr(at, kind) if fragment in w.label)
+        widget.set_value(answer(answers, path))
+    for key, domain in zip(DOMAIN_KEYS, answers["domain_order"]):
+        at.selectbox(key=key).set_value(domain)
+
+
+def plan_applicants(args):
+    """Answers for every simulated applicant, with the requested share of duplicate emails."""
+    rng = random.Random(args.seed)
+    applicants = [random_applicant(rng, args.existing + i) for i in range(args.applicants)]
+    for i in range(len(applicants)):
+        if rng.random() >= args.duplicates:
+            continue
+        if args.existing and (i == 0 or rng.random() < 0.5):
+            applicants[i]["email"] = f"applicant{rng.randrange(args.existing)}@etu.example.dz"
+        elif i:
+            # someone submitting shortly before, so the two requests overlap
+            other = applicants[max(0, i - rng.randint(1, args.concurrency))]
+            applicants[i]["email"] = other["email"].upper()  # the check is case-insensitive
+    return applicants
+
+
+def submit(answers, timeout):
+    """One applicant session. Returns (outcome, load seconds, submit seconds, message)."""
+    at = AppTest.from_file(FORM_APP, default_timeout=timeout)
+    start = time.perf_counter()
+    at.run()
+    loaded = time.perf_counter()
+    if at.exception:
+        return "error", loaded - start, 0.0, at.exception[0].value
+    fill_form(at, answers)
+    next(b for b in at.button if "Submit" in b.label).click()
+    clicked = time.perf_counter()
+    at.run()
+    done = time.perf_counter()
+    if at.exception:
+        return "error", loaded - start, done - clicked, at.exception[0].value
+    if at.session_state["submitted"]:
+        return "accepted", loaded - start, done - clicked, ""
+    warnings = [w.value for w in at.warning]
+    if any("already exists" in w for w in warnings):
+        return "duplicate", loaded - start, done - clicked, warnings[0]
+    messages = [e.value for e in at.error] + warnings
+    return "rejected", loaded - start, done - clicked, messages[0] if messages else ""
+
+
+def worker(wid, args, applicants, tasks, results, barrier):
+    """One server process: a warm-up session, then applicants from the queue until it is empty."""
+    service = FakeSheetsService(latency=args.latency, jitter=args.jitter, error_429=args.error_429,
+                                error_5xx=args.error_5xx, error_applied=args.error_applied, seed=args.seed + wid)
+    form = service.create(storage.FORM_SHEET_ID, tabs={"Sheet1": sheet_values(args.existing, seed=args.seed)}).sheet1
+    sheets_client.use_client(service)
+    sheets_client.GUARD.base_delay = 0.2  # keep retry sleeps short against injected faults
+    os.chdir(WORK_DIR)  # the form loads its images relative to the working directory
+
+    # the first visitor opens the sheet and builds this process's caches
+    warmup = submit(random_applicant(random.Random(-wid), 10 ** 9 + wid, email=f"warmup{wid}@load.test"),
+                    args.timeout)
+    guard_before = dict(sheets_client.GUARD.stats)
+    calls_before = Counter(service.calls)
+    errors_before = Counter(service.errors)
+
+    barrier.wait()
+    start = time.time()
+    outcomes = []
+    while True:
+        try:
+            i = tasks.get_nowait()
+        except Empty:
+            break
+        outcomes.append((i,) + submit(applicants[i], args.timeout))
+    end = time.time()
+
+    # keep this process's flusher alive until every journaled row has reached a sheet
+    barrier.wait()
+    journal = Journal(JOURNAL_PATH, "submissions", key_cols=[CANONICAL_HEADERS.index("Email")])
+    deadline = time.monotonic() + args.flush_timeout
+    while journal.pending_count() and time.monotonic() < deadline:
+        time.sleep(0.2)
+    results.put({
+        "worker": wid,
+        "warmup": warmup[0],
+        "start": start,
+        "end": end,
+        "drained": time.time(),
+        "unflushed": journal.pending_count(),
+        "outcomes": outcomes,
+        "calls": dict(Counter(service.calls) - calls_before),
+        "errors": dict(Counter(service.errors) - errors_before),
+        "guard": {k: v - guard_before.get(k, 0) for k, v in sheets_client.GUARD.stats.items()},
+        "appended_emails": [row[EMAIL_COLUMN - 1] for row in form.rows[1 + args.existing:]],
+    })
+
+
+def check_duplicates(applicants, outcomes, seeded_emails, sheet_emails):
+    """Every email accepted exactly once, never if it was already in the sheet."""
+    accepted = Counter()
+    tried = set()
+    for answers, (outcome, *_rest) in zip(applicants, outcomes):
+        email = answers["email"].strip().lower()
+        tried.add(email)
+        if outcome == "accepted":
+            accepted[email] += 1
+    problems = []
+    for email in sorted(tried):
+        expected = 0 if email in seeded_emails else 1
+        if accepted[email] != expected:
+            problems.append({"email": email, "accepted": accepted[email], "expected": expected})
+    in_sheet = Counter(e.strip().lower() for e in sheet_emails if e.strip())
+    problems += [{"email": e, "rows_in_sheet": n} for e, n in in_sheet.items() if n > 1]
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent applicant load test against a fake Sheets backend.")
+    parser.add_argument("--applicants", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4, help="applicant sessions at once (worker processes)")
+    parser.add_argument("--duplicates", type=float, default=0.1, help="share of applicants reusing an email")
+    parser.add_argument("--existing", type=int, default=500, help="submissions already in the sheet")
+    parser.add_argument("--latency", type=float, default=0.1, help="fake API latency per call (s)")
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--error-429", type=float, default=0.0)
+    parser.add_argument("--error-5xx", type=float, default=0.0)
+    parser.add_argument("--error-applied", type=float, default=0.0,
+                        help="share of writes applied and then failed (503 / timeout)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=120, help="AppTest script timeout (s)")
+    parser.add_argument("--flush-timeout", type=float, default=120)
+    parser.add_argument("--out", help="also write the report as JSON here")
+    args = parser.parse_args(argv)
+
+    applicants = plan_applicants(args)
+    for name in os.listdir(APP_DIR):
+        if name.endswith((".png", ".jpg")):
+            shutil.copy(os.path.join(APP_DIR, name), WORK_DIR)
+
+    ctx = multiprocessing.get_context("spawn")
+    tasks, results = ctx.Queue(), ctx.Queue()
+    for i in range(len(applicants)):
+        tasks.put(i)
+    barrier = ctx.Barrier(args.concurrency)
+    workers = [ctx.Process(target=worker, args=(w, args, applicants, tasks, results, barrier))
+               for w in range(args.concurrency)]
+    try:
+        for proc in workers:
+            proc.start()
+        reports = [results.get(timeout=args.timeout * (len(applicants) + 2) + args.flush_timeout)
+                   for _ in workers]
+        for proc in workers:
+            proc.join()
+    finally:
+        for proc in workers:
+            if proc.is_alive():
+                proc.terminate()
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    outcomes = [None] * len(applicants)
+    for rep in reports:
+        for i, *result in rep["outcomes"]:
+            outcomes[i] = tuple(result)
+    start = min(r["start"] for r in reports)
+    elapsed = max(r["end"] for r in reports) - start
+    drained = max(r["drained"] for r in reports) - start
+    calls, injected, guard = Counter(), Counter(), Counter()
+    for rep in reports:
+        calls.update(rep["calls"])
+        injected.update(rep["errors"])
+        guard.update(rep["guard"])
+    appended = [e for rep in reports for e in rep["appended_emails"]]
+    warmups = [f"warmup{r['worker']}@load.test" for r in reports if r["warmup"] == "accepted"]
+    unflushed = sum(r["unflushed"] for r in reports) // len(reports)  # same shared journal
+
+    seeded = sheet_values(args.existing, seed=args.seed)
+    seeded_emails = {row[EMAIL_COLUMN - 1].strip().lower() for row in seeded[1:]}
+    problems = check_duplicates(applicants, outcomes, seeded_emails, appended)
+    keys = Counter(e.strip().lower() for e in appended + list(seeded_emails) if e.strip())
+    duplicate_keys = sorted(e for e, n in keys.items() if n > 1)
+    accepted = sum(1 for o in outcomes if o[0] == "accepted")
+    missing = accepted + len(warmups) - len(appended)
+    counts = Counter(o[0] for o in outcomes)
+    errors = Counter(o[3] for o in outcomes if o[0] in ("error", "rejected"))
+    total_calls = sum(calls.values())
+    report = {
+        "config": {k: v for k, v in vars(args).items() if k != "out"},
+        "outcomes": dict(counts),
+        "wall_s": round(elapsed, 3),
+        "throughput_per_s": round(len(outcomes) / elapsed, 2),
+        "accepted_per_s": round(accepted / elapsed, 2),
+        "page_load": percentiles([o[1] for o in outcomes]),
+        "submit": percentiles([o[2] for o in outcomes if o[0] != "error"]),
+        "api_calls": total_calls,
+        "api_calls_per_submission": round(total_calls / accepted, 3) if accepted else None,
+        "api_calls_by_method": dict(calls),
+        "injected_errors": {str(k): v for k, v in injected.items()},
+        "quota_guard": dict(guard),
+        "unflushed_rows": unflushed,
+        "rows_missing_from_sheet": missing,
+        "flush_drained_s": round(drained, 3),
+        "duplicate_check": {"correct": not problems, "problems": problems[:20]},
+        "duplicate_keys_in_sheet": duplicate_keys[:20],
+        "errors": dict(errors.most_common(5)),
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    print(text)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    ok = not problems and not duplicate_keys and not unflushed and not missing and not counts["error"]
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
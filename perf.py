@@ -0,0 +1,188 @@
+# perf.py
+# Lightweight timing spans for the Streamlit apps, kept process-wide.
+#
+# Each rerun of an app is bracketed by begin_rerun(app) / end_rerun(); inside
+# it, `with span("name"):` times a section. Every finished span and rerun is
+# pushed onto a bounded ring buffer (the last RING_SIZE entries), shared by
+# all sessions of the server process, so recording costs a deque append and
+# memory stays flat however long the server runs.
+#
+# Sheets API calls are counted where they are issued (QuotaGuard.call, once
+# per attempt) and charged to the rerun running on the calling thread; calls
+# made by background threads (flushers, refreshers) are counted separately.
+# tracked() wraps a Streamlit cache decorator to count calls and misses.
+#
+# Reruns that end in st.stop() (login page, rejected submit) never reach
+# end_rerun() and are not in the rerun table; their spans still are.
+import time
+import threading
+import functools
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+RING_SIZE = 5000      # spans kept
+RERUN_RING_SIZE = 500  # reruns kept
+
+_spans = deque(maxlen=RING_SIZE)          # (ended at, app, rerun id, name, seconds)
+_reruns = deque(maxlen=RERUN_RING_SIZE)   # (ended at, app, rerun id, seconds, api calls)
+_caches = {}                              # name -> [calls, misses]
+_background_api_calls = [0]
+_rerun_ids = iter(range(1, 2 ** 62))
+_lock = threading.Lock()
+_local = threading.local()
+
+
+# ------------------------------
+# Recording
+# ------------------------------
+def begin_rerun(app):
+    """Start timing a script run on this thread."""
+    with _lock:
+        rerun = next(_rerun_ids)
+    _local.app, _local.rerun = app, rerun
+    _local.started, _local.api_calls = time.perf_counter(), 0
+    return rerun
+
+
+def end_rerun():
+    if getattr(_local, "rerun", None) is None:
+        return
+    record = (time.time(), _local.app, _local.rerun, time.perf_counter() - _local.started, _local.api_calls)
+    _local.rerun = None
+    with _lock:
+        _reruns.append(record)
+
+
+def record(name, seconds):
+    app, rerun = getattr(_local, "app", None), getattr(_local, "rerun", None)
+    with _lock:
+        _spans.append((time.time(), app or "background", rerun, name, seconds))
+
+
+class span:
+    """with span("ensure_headers"): ... -- also usable as a decorator."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.started)
+        return False
+
+    def __call__(self, fn):
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            with span(self.name):
+                return fn(*args, **kwargs)
+        return timed
+
+
+def api_call():
+    """One Sheets API request was sent."""
+    if getattr(_local, "rerun", None) is not None:
+        _local.api_calls += 1
+    else:
+        with _lock:
+            _background_api_calls[0] += 1
+
+
+def tracked(cache, name=None):
+    """Count calls and misses of a cached function.
+
+    Wraps a Streamlit cache decorator: @tracked(st.cache_resource) or
+    @tracked(st.cache_data(ttl=60)). The body only runs on a miss.
+    """
+    def wrap(fn):
+        label = name or fn.__name__
+        stats = _caches.setdefault(label, [0, 0])
+
+        @functools.wraps(fn)
+        def body(*args, **kwargs):
+            with _lock:
+                stats[1] += 1
+            with span(f"miss:{label}"):
+                return fn(*args, **kwargs)
+
+        cached = cache(body)
+
+        @functools.wraps(fn)
+        def call(*args, **kwargs):
+            with _lock:
+                stats[0] += 1
+            return cached(*args, **kwargs)
+
+        call.clear = cached.clear
+        return call
+    return wrap
+
+
+def reset():
+    with _lock:
+        _spans.clear()
+        _reruns.clear()
+        for stats in _caches.values():
+            stats[:] = [0, 0]
+        _background_api_calls[0] = 0
+
+
+# ------------------------------
+# Reports
+# ------------------------------
+def _percentiles(ms):
+    return {
+        "count": len(ms), "p50_ms": np.percentile(ms, 50), "p95_ms": np.percentile(ms, 95),
+        "p99_ms": np.percentile(ms, 99), "max_ms": ms.max(), "total_s": ms.sum() / 1000,
+    }
+
+
+def span_table(app=None):
+    """Latency percentiles per span name, slowest p95 first."""
+    with _lock:
+        spans = [s for s in _spans if app is None or s[1] == app]
+    if not spans:
+        return pd.DataFrame()
+    frame = pd.DataFrame(spans, columns=["at", "app", "rerun", "name", "seconds"])
+    rows = {name: _percentiles(group["seconds"].to_numpy() * 1000) for name, group in frame.groupby("name")}
+    return pd.DataFrame.from_dict(rows, orient="index").sort_values("p95_ms", ascending=False).round(2)
+
+
+def rerun_table(app=None):
+    """One row per completed rerun, oldest first."""
+    with _lock:
+        reruns = [r for r in _reruns if app is None or r[1] == app]
+    frame = pd.DataFrame(reruns, columns=["at", "app", "rerun", "seconds", "api_calls"])
+    frame["ms"] = (frame.pop("seconds") * 1000).round(1)
+    frame["at"] = pd.to_datetime(frame["at"], unit="s")
+    return frame
+
+
+def rerun_summary(app=None):
+    frame = rerun_table(app)
+    if frame.empty:
+        return {}
+    return {**_percentiles(frame["ms"].to_numpy()), "api_calls_mean": frame["api_calls"].mean()}
+
+
+def cache_table():
+    with _lock:
+        rows = {name: (calls, misses) for name, (calls, misses) in _caches.items() if calls}
+    if not rows:
+        return pd.DataFrame()
+    frame = pd.DataFrame.from_dict(rows, orient="index", columns=["calls", "misses"])
+    frame["hit_rate"] = ((frame["calls"] - frame["misses"]) / frame["calls"]).round(3)
+    return frame.sort_values("calls", ascending=False)
+
+
+def background_api_calls():
+    return _background_api_calls[0]
+
+
+def apps():
+    with _lock:
+        return sorted({s[1] for s in _spans} | {r[1] for r in _reruns})
@@ -0,0 +1,88 @@
+# rescore.py
+# Recompute every stored score in the form sheet with the current rubric.
+#
+# Reads the sheet once, rescores all rows with scoring.score_frame(), and writes
+# back only the score cells that changed, in a single batch_update.
+#
+#   python rescore.py --dry-run            # show the diff, write nothing
+#   python rescore.py                      # apply
+#   python rescore.py --key-file key.json  # use a service-account file instead of st.secrets
+import sys
+import json
+import argparse
+
+import numpy as np
+import pandas as pd
+from gspread.utils import rowcol_to_a1
+
+from schema import SCORE_COLUMNS, build_frame
+from scoring import score_frame
+from sheets_client import open_worksheet
+
+SHEET_ID = "1wpyHQf51TxG7mUM6MikyGBsz9maN471y1sO03BPOEUo"
+
+
+def rank_positions(scores):
+    # highest score first; ties keep sheet order
+    return scores.rank(method="first", ascending=False).astype(int)
+
+
+def rescore_sheet(sheet, dry_run=True):
+    """Returns (report dict, diff DataFrame). Writes the changes unless dry_run."""
+    values = sheet.get_all_values()
+    header = values[0] if values else []
+    df = build_frame(header, values[1:])  # left as strings: "Old" shows the cell as stored
+
+    new = score_frame(df)
+    updates, diff = [], []
+    for col in SCORE_COLUMNS:
+        if col not in header:
+            continue
+        old = pd.to_numeric(df[col], errors="coerce")
+        changed = ~np.isclose(old.to_numpy(dtype=float), new[col].to_numpy(dtype=float), equal_nan=False)
+        col_number = header.index(col) + 1
+        for row_number in df.index[changed]:
+            value = new.at[row_number, col].item()
+            updates.append({"range": rowcol_to_a1(row_number, col_number), "values": [[value]]})
+            diff.append({
+                "Row": row_number,
+                "Name": df.at[row_number, "Name"] if "Name" in header else "",
+                "Column": col,
+                "Old": df.at[row_number, col],
+                "New": value,
+            })
+
+    old_total = pd.to_numeric(df["Total_Score"], errors="coerce").fillna(0) if "Total_Score" in header else new["Total_Score"]
+    rankings_changed = int((rank_positions(old_total) != rank_positions(new["Total_Score"])).sum()) if len(df) else 0
+
+    report = {
+        "rows_scanned": len(df),
+        "cells_changed": len(updates),
+        "rows_changed": len({d["Row"] for d in diff}),
+        "rankings_changed": rankings_changed,
+        "dry_run": dry_run,
+    }
+    if updates and not dry_run:
+        sheet.batch_update(updates, value_input_option="USER_ENTERED")
+    return report, pd.DataFrame(diff, columns=["Row", "Name", "Column", "Old", "New"])
+
+
+def open_sheet(key_file=None):
+    return open_worksheet(SHEET_ID, key_file=key_file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rescore every applicant with the current rubric.")
+    parser.add_argument("--dry-run", action="store_true", help="print the changes without writing them")
+    parser.add_argument("--key-file", help="service-account JSON file (default: st.secrets)")
+    args = parser.parse_args(argv)
+
+    report, diff = rescore_sheet(open_sheet(args.key_file), dry_run=args.dry_run)
+    if not diff.empty:
+        print(diff.to_string(index=False))
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
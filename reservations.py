@@ -0,0 +1,57 @@
+# reservations.py
+# Atomic duplicate reservation for submissions.
+#
+# Each submission claims its normalized email and Student_ID in a SQLite table
+# keyed by those values. The PRIMARY KEY makes the claim a compare-and-set: when
+# two sessions (or two server processes sharing the same file) submit the same
+# email at the same moment, exactly one INSERT wins. Only the colliding keys
+# contend; unrelated submissions never wait on each other beyond the few
+# microseconds of the write itself.
+import time
+import sqlite3
+import threading
+
+
+def reservation_keys(email, student_id=""):
+    keys = [f"email:{str(email).strip().lower()}"]
+    if str(student_id).strip():
+        keys.append(f"sid:{str(student_id).strip().lower()}")
+    return keys
+
+
+class ReservationLedger:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS reservations (
+                key TEXT PRIMARY KEY,
+                created_at REAL NOT NULL
+            )
+        """)
+
+    def reserve(self, keys):
+        """Claim all keys or none. Returns False if any key is already taken."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO reservations (key, created_at) VALUES (?, ?)",
+                    [(k, now) for k in keys],
+                )
+            except sqlite3.IntegrityError:
+                self._conn.execute("ROLLBACK")
+                return False
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return True
+
+    def release(self, keys):
+        """Give keys back, e.g. when the submission could not be stored."""
+        with self._lock:
+            self._conn.executemany("DELETE FROM reservations WHERE key = ?", [(k,) for k in keys])
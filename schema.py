@@ -0,0 +1,211 @@
+# schema.py
+# Column layout and dtypes of the form sheet, shared by the form and the admin apps.
+#
+# CANONICAL_HEADERS is the exact column order user_form writes. Admin frames are
+# typed from it: low-cardinality answers (single-choice questions, ratings,
+# department, year) become pandas categoricals -- one small integer code per
+# row instead of a Python string object -- and scores become float32.
+#
+# Layouts are versioned. Raw get_values() rows are mapped positionally onto the
+# header, column by column, straight into the DataFrame (no dict per row as
+# with get_all_records). check_header() tells which layout a sheet uses and
+# reports drift -- missing, unexpected or moved columns -- against the closest
+# known one.
+import pandas as pd
+
+
+class SchemaDriftError(Exception):
+    pass
+
+
+# v1: the layout admin_dashbord.py was written for
+LEGACY_HEADERS = [
+    "Name","Email","Department","Academic_Year","FB_Link","Discord_ID",
+    "Domain_Interest","Areas","Programming_Languages","Self_Rate","Portfolio",
+    "Tools","Domain_Extra","Why_Join","Motivation","Teamwork","Future_Goal",
+    "Free_Time","Active_Events","How_Know_Us","Other_Team","Role","Team_Leader",
+    "Extra","Score","Date"
+]
+
+# v2: what user_form writes today
+
+CANONICAL_HEADERS = [
+    # --- Basic Info ---
+    "Name", "Email", "Phone", "Student_ID", "Department", "Academic_Year",
+    "FB_Link", "Discord_ID", "Date_Birth",
+
+    # --- Domain Preferences ---
+    "Domain_Interest_Order",
+
+    # --- Tech Domain ---
+    "Tech_Areas",
+    "Tech_Programming_Languages",
+    "Tech_Project_Desc",
+    "Tech_Portfolio",
+    "Tech_Tools",
+    "Tech_Self_Rate",
+    "Tech_Score",
+
+    # --- Media Domain ---
+    "Media_Areas",
+    "Media_Tools",
+    "Media_Freelance",
+    "Media_Tasks",
+    "Media_Editing_Tools",
+    "Media_Equipment",
+    "Media_Portfolio",
+    "Media_Project_Desc",
+    "Media_DesignRate",
+    "Media_EditingRate",
+    "Media_Score",
+
+    # --- Sponsoring Domain ---
+    "Sponsor_Areas",
+    "Sponsor_Exp_Desc",
+    "Sponsor_Event_Participation",
+    "Sponsor_Connections",
+    "Sponsor_Public_Speaking",
+    "Sponsor_Represent_Club",
+    "Sponsor_Comm_Rate",
+    "Sponsor_Score",
+
+    # --- Motivation & Availability ---
+    "Why_Join",
+    "What_Learn",
+    "Other_Club",
+    "Leadership",
+    "Challenge",
+    "Manage_Time",
+    "Communication_Skills",
+    "Public_Speaking",
+    "Anything_To_Add",
+
+    # --- Final Scoring & Meta ---
+    "Total_Score",
+    "Submission_Date"
+]
+
+FORM_LAYOUTS = {1: LEGACY_HEADERS, 2: CANONICAL_HEADERS}
+FORM_VERSION = 2
+
+# v1 columns that still exist under a new name
+LEGACY_RENAMES = {
+    "Score": "Total_Score",
+    "Date": "Submission_Date",
+    "Domain_Interest": "Domain_Interest_Order",
+}
+
+REVIEW_HEADERS = [
+    "Admin_Name", "Student_Name", "Tech_Score", "Media_Score",
+    "Sponsor_Score", "Domain_Order", "Final_Score_of_Domains",
+    "Motivation_Score", "Skills_Score", "Computed_Total",
+    "Note", "Date"
+]
+REVIEW_LAYOUTS = {1: REVIEW_HEADERS}
+
+# admin_dashbord's "admin_notes" tab
+NOTE_HEADERS = ["Name", "Note", "Date"]
+
+SCORE_COLUMNS = ["Tech_Score", "Media_Score", "Sponsor_Score", "Total_Score"]
+SCORE_DTYPE = "float32"
+
+# single-choice questions, sliders and short, repetitive text fields
+CATEGORY_COLUMNS = [
+    "Department", "Academic_Year", "Domain_Interest_Order",
+    "Tech_Portfolio", "Tech_Self_Rate",
+    "Media_Freelance", "Media_Portfolio", "Media_DesignRate", "Media_EditingRate",
+    "Sponsor_Event_Participation", "Sponsor_Connections", "Sponsor_Public_Speaking",
+    "Sponsor_Represent_Club", "Sponsor_Comm_Rate",
+    "Other_Club", "Leadership", "Communication_Skills",
+]
+
+
+def apply_dtypes(df):
+    """Convert the known columns of a string frame in place and return it."""
+    for col in SCORE_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype(SCORE_DTYPE)
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+
+# ------------------------------
+# Layout detection
+# ------------------------------
+def header_drift(header, expected):
+    """Differences between a sheet header and a known layout."""
+    header = [h for h in header if h]
+    present = set(header)
+    # relative order of the shared columns, so one insertion is not reported as
+    # every later column having moved
+    ours = [h for h in header if h in expected]
+    theirs = [h for h in expected if h in present]
+    return {
+        "missing": [h for h in expected if h not in present],
+        "unexpected": [h for h in header if h not in expected],
+        "moved": [a for a, b in zip(ours, theirs) if a != b],
+    }
+
+
+def check_header(header, layouts=None):
+    """(version, drift). version is None when the header matches no known layout;
+    drift is then measured against the closest one (empty when it matches)."""
+    layouts = FORM_LAYOUTS if layouts is None else layouts
+    trimmed = list(header)
+    while trimmed and trimmed[-1] == "":
+        trimmed.pop()
+    for version, expected in layouts.items():
+        if trimmed == expected:
+            return version, {"missing": [], "unexpected": [], "moved": []}
+    closest = max(layouts.items(), key=lambda item: len(set(item[1]) & set(trimmed)))
+    return None, header_drift(trimmed, closest[1])
+
+
+def upgrade_columns(df):
+    """Frame with v1 columns renamed to their current names."""
+    return df.rename(columns={k: v for k, v in LEGACY_RENAMES.items() if k in df.columns and v not in df.columns})
+
+
+# ------------------------------
+# Positional parsing
+# ------------------------------
+def build_frame(header, rows, first_row=2):
+    """DataFrame from raw rows, mapped positionally onto `header`.
+
+    Short rows (get_values trims trailing blanks) are padded with "" and extra
+    cells beyond the header are dropped. The index is the sheet row number.
+    """
+    width = len(header)
+    rows = [r if len(r) == width else (list(r) + [""] * width)[:width] for r in rows]
+    df = pd.DataFrame(rows, index=pd.RangeIndex(first_row, first_row + len(rows), name="Row"),
+                      columns=range(width), dtype=str)
+    df.columns = list(header)
+    return df
+
+
+def typed_frame(header, rows, first_row=2, upgrade=True):
+    """build_frame() with v1 form columns renamed (upgrade=True), then typed, so
+    a legacy "Score" column comes out as a float32 "Total_Score"."""
+    df = build_frame(header, rows, first_row)
+    if upgrade:
+        df = upgrade_columns(df)
+    return apply_dtypes(df)
+
+
+def parse_values(values, layouts=None, strict=False):
+    """Typed DataFrame from a get_values() result (header row first).
+
+    With strict=True an unknown header raises SchemaDriftError; otherwise the
+    sheet's own header is used as is.
+    """
+    if not values:
+        return pd.DataFrame()
+    layouts = FORM_LAYOUTS if layouts is None else layouts
+    header = values[0]
+    version, drift = check_header(header, layouts)
+    if version is None and strict:
+        raise SchemaDriftError(f"unknown sheet layout: {drift}")
+    # legacy renames only apply to the form ("Date" is current in the reviews tab)
+    return typed_frame(header, values[1:], upgrade=layouts is FORM_LAYOUTS)
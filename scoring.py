@@ -0,0 +1,362 @@
+# scoring.py
+# Application scoring rubric.
+#
+# Two entry points over the same point tables:
+#   - score_applicant(): one applicant, from the form's widget values (used on submit)
+#   - score_frame():     a whole DataFrame of submissions as stored in the sheet,
+#                        computed with vectorized pandas/NumPy operations
+#
+# The vectorized path splits into build_features() (answers -> per-applicant
+# feature matrices, once per snapshot) and score_features() (one matrix-vector
+# product per domain for a given rubric), which is what the what-if simulator
+# in admin_dash.py re-runs on every slider change.
+import numpy as np
+import pandas as pd
+
+from form_options import (
+    TECH_AREAS, TECH_LANGUAGES, TECH_PROJECTS, TECH_TOOLS,
+    MEDIA_AREAS, MEDIA_TOOLS, MEDIA_FREELANCE, MEDIA_TASKS, MEDIA_EDITING_TOOLS,
+    MEDIA_EQUIPMENT, MEDIA_PROJECTS,
+    SPONSOR_AREAS, SPONSOR_EXPERIENCE, SPONSOR_EVENT_PARTICIPATION, SPONSOR_CONNECTIONS,
+    SPONSOR_PUBLIC_SPEAKING, SPONSOR_REPRESENT_CLUB,
+)
+
+DOMAINS = ["Tech", "Media", "Sponsoring"]
+
+# weight of the 1st / 2nd / 3rd choice, and the divisor applied to the weighted sum
+DOMAIN_WEIGHTS = (0.6, 0.25, 0.15)
+DOMAIN_DIVISOR = 3
+
+# ------------------------------
+# Point tables
+# ------------------------------
+# (points per selected option, max number of options counted)
+TECH_AREAS_POINTS = (3, 8)
+TECH_LANGUAGES_POINTS = (2, 8)
+TECH_TOOLS_POINTS = (3, 10)  # max 30 pts; "No, but I’d like to try" does not count
+TECH_TOOLS_EXCLUDED = "No, but I’d like to try"
+
+MEDIA_AREAS_POINTS = (2, 5)
+MEDIA_TOOLS_POINTS = (2, 5)  # max 10 pts; "None, but I’d like to learn" does not count
+MEDIA_TOOLS_EXCLUDED = "None, but I’d like to learn"
+MEDIA_TASKS_POINTS = (3, 6)
+MEDIA_EDITING_TOOLS_POINTS = (2, 6)
+MEDIA_EQUIPMENT_POINTS = (2, 6)
+
+SPONSOR_AREAS_POINTS = (5, 5)
+
+
+def tech_project_points(option):
+    if option in [
+        "Modified or improved existing ideas or systems",
+        "Conduct practical experiments or hands-on technical tests occasionally",
+    ]:
+        return 1
+    elif option == "Not yet, but excited to start":
+        return 0
+    return 2
+
+
+def media_project_points(option):
+    if "-2" in option:
+        return 2
+    elif "-1" in option:
+        return 1
+    return 0
+
+
+TECH_SELF_RATE_POINTS = {0: 0, 1: 2, 2: 5, 3: 7, 4: 9, 5: 12}
+
+MEDIA_FREELANCE_POINTS = {"Yes": 10, "Not yet, but I’d like to": 3}
+MEDIA_DESIGN_RATE_POINTS = {0: 0, 1: 2, 2: 4, 3: 6, 4: 8, 5: 10}
+MEDIA_EDITING_RATE_POINTS = {0: 0, 1: 1, 2: 2, 3: 3, 4: 5, 5: 7}
+
+SPONSOR_EVENT_POINTS = {
+    "Yes, many times": 10,
+    "Yes, once or twice": 4,
+    "No, but I'd like to learn": 0,
+}
+SPONSOR_CONNECTIONS_POINTS = {"Yes": 10, "Maybe": 5, "No": 0}
+SPONSOR_PUBLIC_SPEAKING_POINTS = {
+    "Yes, confidently": 10,
+    "Sometimes": 5,
+    "Not really, but I’d like to get better": 2,
+    "No, I prefer working behind the scenes": 0,
+}
+SPONSOR_REPRESENT_POINTS = {"Yes, definitely": 8, "Maybe": 4, "Not really": 0}
+SPONSOR_COMM_RATE_POINTS = {0: 0, 1: 2, 2: 4, 3: 6, 4: 9, 5: 12}
+
+
+def _capped(count, points):
+    per_item, max_items = points
+    return min(count, max_items) * per_item
+
+
+# ------------------------------
+# Single applicant
+# ------------------------------
+def compute_domain_score(domain, dd):
+    if domain == "Tech":
+        s = _capped(len(dd.get("areas", [])), TECH_AREAS_POINTS)
+        s += _capped(len(dd.get("languages", [])), TECH_LANGUAGES_POINTS)
+        s += sum(tech_project_points(p) for p in dd.get("project_desc", []))
+        s += _capped(sum(1 for t in dd.get("tools", []) if t != TECH_TOOLS_EXCLUDED), TECH_TOOLS_POINTS)
+        # Portfolio: always 0 pts
+        s += TECH_SELF_RATE_POINTS.get(dd.get("self_rate", 3), 7)
+        return s
+
+    elif domain == "Media":
+        s = _capped(len(dd.get("areas", [])), MEDIA_AREAS_POINTS)
+        s += _capped(sum(1 for t in dd.get("tools", []) if t != MEDIA_TOOLS_EXCLUDED), MEDIA_TOOLS_POINTS)
+        s += MEDIA_FREELANCE_POINTS.get(dd.get("freelance_exp", ""), 0)
+        s += _capped(len(dd.get("media_tasks", [])), MEDIA_TASKS_POINTS)
+        s += _capped(len(dd.get("editing_tools", [])), MEDIA_EDITING_TOOLS_POINTS)
+        s += _capped(len(dd.get("deep_tools", [])), MEDIA_EQUIPMENT_POINTS)
+        # Portfolio: 0 pts
+        s += sum(media_project_points(p) for p in dd.get("project_desc", []))
+        s += MEDIA_DESIGN_RATE_POINTS.get(dd.get("designrate", 3), 6)
+        s += MEDIA_EDITING_RATE_POINTS.get(dd.get("editingrate", 3), 3)
+        return s
+
+    else:
+        s = _capped(len(dd.get("areas", [])), SPONSOR_AREAS_POINTS)
+        # Experience: the form passes this list as "exp_desc", so it has never
+        # contributed to stored scores; kept as-is so they stay reproducible.
+        exp = dd.get("exp", [])
+        if "None" not in exp:
+            s += min(len(exp), 5) * 5
+        s += SPONSOR_EVENT_POINTS.get(dd.get("event_participation"), 0)
+        s += SPONSOR_CONNECTIONS_POINTS.get(dd.get("connections"), 0)
+        s += SPONSOR_PUBLIC_SPEAKING_POINTS.get(dd.get("public_speaking"), 0)
+        s += SPONSOR_REPRESENT_POINTS.get(dd.get("represent_club"), 0)
+        s += SPONSOR_COMM_RATE_POINTS.get(dd.get("comm_rate", 3), 6)
+        return s
+
+
+def normalize_domain_order(domain_order):
+    if isinstance(domain_order, list):
+        return [d.strip().capitalize() for d in domain_order]
+    return [d.strip().capitalize() for d in str(domain_order).split(",")]
+
+
+def score_applicant(domain_order, tech_data, media_data, sponsor_data):
+    """Returns ({domain: score}, total_score) for one applicant."""
+    domain_order = normalize_domain_order(domain_order)
+    domain_scores = {
+        "Tech": compute_domain_score("Tech", tech_data),
+        "Media": compute_domain_score("Media", media_data),
+        "Sponsoring": compute_domain_score("Sponsoring", sponsor_data),
+    }
+    # Choices are labelled "Sponsor" on the form but scored as "Sponsoring", so the
+    # sponsoring score does not enter the weighted total (historic behaviour).
+    total = sum(
+        domain_scores.get(d, 0) * w for d, w in zip(domain_order, DOMAIN_WEIGHTS)
+    ) / DOMAIN_DIVISOR
+    return domain_scores, round(total, 2)
+
+
+# ------------------------------
+# Whole DataFrame (vectorized)
+# ------------------------------
+def option_matrix(series, options):
+    """Boolean frame with one column per option: True where the stored answer contains it.
+
+    Answers repeat a lot, so each distinct string is decoded once and the
+    result is gathered back to every row with one NumPy take.
+    """
+    codes, uniques = pd.factorize(series.fillna("").astype(str))
+    code_of = {opt: i for i, opt in enumerate(options)}
+    # options that contain ", " themselves are matched before splitting
+    joined = [(opt, i) for i, opt in enumerate(options) if ", " in opt]
+    rows, cols = [], []
+    for u, text in enumerate(uniques.tolist()):
+        for opt, i in joined:
+            if opt in text:
+                rows.append(u)
+                cols.append(i)
+                text = text.replace(opt, "")
+        for part in text.split(", "):
+            i = code_of.get(part)
+            if i is not None:
+                rows.append(u)
+                cols.append(i)
+    decoded = np.zeros((len(uniques), len(options)), dtype=bool)
+    decoded[rows, cols] = True
+    return pd.DataFrame(decoded[codes], columns=list(options), index=series.index)
+
+
+def _column(df, name):
+    if name in df.columns:
+        return df[name]
+    return pd.Series("", index=df.index)
+
+
+def _per_value(series, fn):
+    """Apply `fn` once per distinct value and broadcast the results to every row."""
+    codes, uniques = pd.factorize(series.fillna("").astype(str))
+    return np.array([fn(u) for u in uniques.tolist()] or [0])[codes]
+
+
+def _rate_value(text):
+    # blank or out-of-range rates score like a 3 (the tables' fallback value)
+    try:
+        rate = int(float(text))
+    except ValueError:
+        return 3
+    return rate if 0 <= rate <= 5 else 3
+
+
+RATES = [0, 1, 2, 3, 4, 5]
+
+# (rubric key, kind, sheet column, options, max options counted)
+#   count:   min(#selected, max) -> points per selected option
+#   options: one column per option -> points per option
+#   choice:  one-hot single answer -> points per answer
+#   rate:    one-hot 0..5 slider -> points per rate
+SCORING_SPEC = {
+    "Tech": [
+        ("areas", "count", "Tech_Areas", TECH_AREAS, TECH_AREAS_POINTS[1]),
+        ("languages", "count", "Tech_Programming_Languages", TECH_LANGUAGES, TECH_LANGUAGES_POINTS[1]),
+        ("projects", "options", "Tech_Project_Desc", TECH_PROJECTS, None),
+        ("tools", "count", "Tech_Tools", [t for t in TECH_TOOLS if t != TECH_TOOLS_EXCLUDED], TECH_TOOLS_POINTS[1]),
+        ("self_rate", "rate", "Tech_Self_Rate", RATES, None),
+    ],
+    "Media": [
+        ("areas", "count", "Media_Areas", MEDIA_AREAS, MEDIA_AREAS_POINTS[1]),
+        ("tools", "count", "Media_Tools", [t for t in MEDIA_TOOLS if t != MEDIA_TOOLS_EXCLUDED], MEDIA_TOOLS_POINTS[1]),
+        ("freelance", "choice", "Media_Freelance", MEDIA_FREELANCE, None),
+        ("tasks", "count", "Media_Tasks", MEDIA_TASKS, MEDIA_TASKS_POINTS[1]),
+        ("editing_tools", "count", "Media_Editing_Tools", MEDIA_EDITING_TOOLS, MEDIA_EDITING_TOOLS_POINTS[1]),
+        ("equipment", "count", "Media_Equipment", MEDIA_EQUIPMENT, MEDIA_EQUIPMENT_POINTS[1]),
+        ("projects", "options", "Media_Project_Desc", MEDIA_PROJECTS, None),
+        ("design_rate", "rate", "Media_DesignRate", RATES, None),
+        ("editing_rate", "rate", "Media_EditingRate", RATES, None),
+    ],
+    "Sponsoring": [
+        ("areas", "count", "Sponsor_Areas", SPONSOR_AREAS, SPONSOR_AREAS_POINTS[1]),
+        ("experience", "count", "Sponsor_Exp_Desc", [e for e in SPONSOR_EXPERIENCE if e != "None"], 5),
+        ("event", "choice", "Sponsor_Event_Participation", SPONSOR_EVENT_PARTICIPATION, None),
+        ("connections", "choice", "Sponsor_Connections", SPONSOR_CONNECTIONS, None),
+        ("public_speaking", "choice", "Sponsor_Public_Speaking", SPONSOR_PUBLIC_SPEAKING, None),
+        ("represent", "choice", "Sponsor_Represent_Club", SPONSOR_REPRESENT_CLUB, None),
+        ("comm_rate", "rate", "Sponsor_Comm_Rate", RATES, None),
+    ],
+}
+
+
+def default_rubric():
+    """The live rubric as plain data: {domain: {key: points or {answer: points}}}."""
+    return {
+        "domain_weights": list(DOMAIN_WEIGHTS),
+        "divisor": DOMAIN_DIVISOR,
+        # the form labels this choice "Sponsor", which never matched "Sponsoring"
+        "sponsor_choice_counts": False,
+        "Tech": {
+            "areas": TECH_AREAS_POINTS[0],
+            "languages": TECH_LANGUAGES_POINTS[0],
+            "projects": {o: tech_project_points(o) for o in TECH_PROJECTS},
+            "tools": TECH_TOOLS_POINTS[0],
+            "self_rate": dict(TECH_SELF_RATE_POINTS),
+        },
+        "Media": {
+            "areas": MEDIA_AREAS_POINTS[0],
+            "tools": MEDIA_TOOLS_POINTS[0],
+            "freelance": {o: MEDIA_FREELANCE_POINTS.get(o, 0) for o in MEDIA_FREELANCE},
+            "tasks": MEDIA_TASKS_POINTS[0],
+            "editing_tools": MEDIA_EDITING_TOOLS_POINTS[0],
+            "equipment": MEDIA_EQUIPMENT_POINTS[0],
+            "projects": {o: media_project_points(o) for o in MEDIA_PROJECTS},
+            "design_rate": dict(MEDIA_DESIGN_RATE_POINTS),
+            "editing_rate": dict(MEDIA_EDITING_RATE_POINTS),
+        },
+        "Sponsoring": {
+            "areas": SPONSOR_AREAS_POINTS[0],
+            "experience": 0,  # never counted so far, see compute_domain_score
+            "event": {o: SPONSOR_EVENT_POINTS.get(o, 0) for o in SPONSOR_EVENT_PARTICIPATION},
+            "connections": {o: SPONSOR_CONNECTIONS_POINTS.get(o, 0) for o in SPONSOR_CONNECTIONS},
+            "public_speaking": {o: SPONSOR_PUBLIC_SPEAKING_POINTS.get(o, 0) for o in SPONSOR_PUBLIC_SPEAKING},
+            "represent": {o: SPONSOR_REPRESENT_POINTS.get(o, 0) for o in SPONSOR_REPRESENT_CLUB},
+            "comm_rate": dict(SPONSOR_COMM_RATE_POINTS),
+        },
+    }
+
+
+def build_features(df):
+    """Per-applicant feature matrices, computed once per snapshot.
+
+    Returns {"Tech"|"Media"|"Sponsoring": (matrix, names), "order": (3, n) labels}
+    where names[j] = (rubric key, answer or None) for column j. A domain score
+    is then one matrix-vector product with rubric_vector().
+    """
+    features = {}
+    for domain, spec in SCORING_SPEC.items():
+        blocks, names = [], []
+        for key, kind, column, options, max_items in spec:
+            series = _column(df, column)
+            if kind == "count":
+                matrix = option_matrix(series, options).to_numpy()
+                counts = np.minimum(matrix.sum(axis=1), max_items)
+                if key == "experience":
+                    counts = np.where(option_matrix(series, ["None"]).to_numpy()[:, 0], 0, counts)
+                blocks.append(counts[:, None])
+                names.append((key, None))
+            elif kind == "options":
+                blocks.append(option_matrix(series, options).to_numpy())
+                names += [(key, o) for o in options]
+            elif kind == "choice":
+                value = _per_value(series, lambda text, opts=options: opts.index(text) if text in opts else -1)
+                blocks.append(value[:, None] == np.arange(len(options)))
+                names += [(key, o) for o in options]
+            else:
+                value = _per_value(series, _rate_value)
+                blocks.append(value[:, None] == np.arange(len(options)))
+                names += [(key, r) for r in options]
+        features[domain] = (np.hstack(blocks).astype(float), names)
+
+    order = _column(df, "Domain_Interest_Order")
+    features["order"] = np.array([
+        _per_value(order, lambda text, pos=pos: (normalize_domain_order(text) + [""] * 3)[pos])
+        for pos in range(3)
+    ])
+    return features
+
+
+def rubric_vector(rubric, domain, names):
+    table = rubric[domain]
+    return np.array([
+        table[key] if answer is None else table[key].get(answer, 0)
+        for key, answer in names
+    ], dtype=float)
+
+
+def score_features(features, rubric):
+    """Tech/Media/Sponsor/Total scores for precomputed features under a rubric."""
+    scores = {
+        domain: features[domain][0] @ rubric_vector(rubric, domain, features[domain][1])
+        for domain in DOMAINS
+    }
+    labels = {"Tech": ["Tech"], "Media": ["Media"], "Sponsoring": ["Sponsoring"]}
+    if rubric.get("sponsor_choice_counts"):
+        labels["Sponsoring"].append("Sponsor")
+    order = features["order"]
+    total = np.zeros(order.shape[1])
+    for pos, weight in enumerate(rubric["domain_weights"]):
+        for domain, names in labels.items():
+            total += np.isin(order[pos], names) * scores[domain] * weight
+    total = np.round(total / rubric["divisor"], 2)
+    return {
+        "Tech_Score": np.rint(scores["Tech"]).astype(int),
+        "Media_Score": np.rint(scores["Media"]).astype(int),
+        "Sponsor_Score": np.rint(scores["Sponsoring"]).astype(int),
+        "Total_Score": total,
+    }
+
+
+def score_frame(df, rubric=None):
+    """Tech/Media/Sponsor/Total scores for every row of a submissions frame.
+
+    `df` uses the sheet's column names, with multi-select answers comma-joined
+    as they are stored. Returns a frame with the four score columns, same index.
+    """
+    scores = score_features(build_features(df), rubric or default_rubric())
+    return pd.DataFrame(scores, index=df.index)
@@ -0,0 +1,130 @@
+# search_index.py
+# In-memory full-text index over the submissions, for the admin search boxes.
+#
+# Text is folded (lowercase, accents stripped: "Sécurité" == "securite") and
+# split into tokens. Two levels of index:
+#   - token -> set of rows containing it (inverted index)
+#   - trigram -> set of tokens containing it, over the vocabulary only
+# A query word is looked up through its trigrams to find every vocabulary token
+# that contains it as a substring, and the rows of those tokens are unioned.
+# Words of a query are ANDed. Because trigrams index the vocabulary (tens of
+# thousands of tokens) and not the raw text, the index stays small while still
+# answering substring queries like "pyth" or "@gmail" in a few milliseconds.
+#
+# sync(snapshot) indexes only the rows appended since the last sync; a full
+# reload of the snapshot (loaded_at changes) rebuilds the index.
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+
+from schema import SCORE_COLUMNS
+
+TOKEN_RE = re.compile(r"\w+")
+# combining marks left over after NFKD: Latin accents and Arabic harakat
+MARKS_RE = re.compile("[\u0300-\u036f\u064b-\u065f\u0670]")
+
+
+def fold(text):
+    """Lowercase and strip accents."""
+    text = str(text)
+    if text.isascii():
+        return text.casefold()
+    return MARKS_RE.sub("", unicodedata.normalize("NFKD", text)).casefold()
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(fold(text))
+
+
+def trigrams(word):
+    return {word[i:i + 3] for i in range(len(word) - 2)}
+
+
+class SearchIndex:
+    def __init__(self, columns=None):
+        # None = every column except the numeric score columns
+        self.columns = list(columns) if columns else None
+        self.row_numbers = []   # doc id -> sheet row number
+        self.vocab = {}         # token -> token id
+        self.tokens = []        # token id -> token
+        self.postings = []      # token id -> set of doc ids
+        self.grams = defaultdict(set)  # trigram -> token ids
+        self.loaded_at = None   # snapshot.loaded_at this index was built from
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.row_numbers)
+
+    def _token_id(self, token):
+        tid = self.vocab.get(token)
+        if tid is None:
+            tid = self.vocab[token] = len(self.tokens)
+            self.tokens.append(token)
+            self.postings.append(set())
+            for gram in trigrams(token):
+                self.grams[gram].add(tid)
+        return tid
+
+    def _text_positions(self, header):
+        if self.columns is None:
+            return [i for i, h in enumerate(header) if h not in SCORE_COLUMNS]
+        return [header.index(c) for c in self.columns if c in header]
+
+    def add_rows(self, header, rows, first_row_number):
+        """Index raw sheet rows; rows[0] is sheet row `first_row_number`."""
+        positions = self._text_positions(header)
+        for offset, row in enumerate(rows):
+            doc = len(self.row_numbers)
+            self.row_numbers.append(first_row_number + offset)
+            text = " ".join(str(row[i]) for i in positions if i < len(row) and row[i] != "")
+            for token in set(tokenize(text)):
+                self.postings[self._token_id(token)].add(doc)
+
+    def clear(self):
+        self.row_numbers, self.vocab, self.tokens, self.postings = [], {}, [], []
+        self.grams = defaultdict(set)
+
+    def sync(self, snapshot):
+        """Catch up with a SheetSnapshot. Returns the number of rows indexed."""
+        with snapshot._lock:
+            header, rows, loaded_at = snapshot.header, snapshot.rows, snapshot.loaded_at
+        with self._lock:
+            if loaded_at != self.loaded_at or len(rows) < len(self.row_numbers):
+                self.clear()
+                self.loaded_at = loaded_at
+            start = len(self.row_numbers)
+            self.add_rows(header, rows[start:], start + 2)
+        return len(rows) - start
+
+    def _matching_tokens(self, word):
+        if len(word) < 3:
+            # too short for a trigram: scan the vocabulary (still far smaller than the text)
+            candidates = range(len(self.tokens))
+        else:
+            grams = sorted(trigrams(word), key=lambda g: len(self.grams.get(g, ())))
+            candidates = set(self.grams.get(grams[0], ()))
+            for gram in grams[1:]:
+                candidates &= self.grams.get(gram, set())
+                if not candidates:
+                    return []
+        return [t for t in candidates if word in self.tokens[t]]
+
+    def _docs(self, word):
+        docs = set()
+        for tid in self._matching_tokens(word):
+            docs |= self.postings[tid]
+        return docs
+
+    def search(self, query):
+        """Sheet row numbers matching every word of the query (substring, accent-insensitive)."""
+        words = sorted(set(tokenize(query)), key=len, reverse=True)
+        with self._lock:
+            if not words:
+                return list(self.row_numbers)
+            docs = self._docs(words[0])
+            for word in words[1:]:
+                if not docs:
+                    break
+                docs &= self._docs(word)
+            return sorted(self.row_numbers[d] for d in docs)
@@ -0,0 +1,235 @@
+# sheet_snapshot.py
+# In-memory snapshot of a worksheet that is kept up to date incrementally.
+#
+# The first sync downloads the whole sheet. After that every sync is a single
+# small read (the change probe): the last few rows we already hold plus
+# whatever follows them. If the tail still matches its checksum, the rows
+# after it are the delta and nothing else is downloaded -- an unchanged sheet
+# costs one tiny request and no bulk read. If the tail changed (edit, delete,
+# re-sort) the snapshot is reloaded in full. Edits above the tail are picked
+# up by a periodic full reload.
+#
+# A snapshot can be projected onto a few columns: header names are mapped to
+# column letters and only those ranges are read with one batch_get, so views
+# that need three columns do not download fifty.
+#
+# With a cache_path, every change is persisted to a local Parquet file that is
+# memory-mapped at startup. A new process renders from it immediately and
+# reconciles with the sheet in a background thread; if Sheets is down the last
+# good snapshot keeps being served read-only.
+import os
+import json
+import time
+import hashlib
+import threading
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from journal import col_letter
+from schema import LEGACY_RENAMES, SCORE_COLUMNS, typed_frame
+
+NUMERIC_COLUMNS = SCORE_COLUMNS
+
+TAIL_ROWS = 3
+FULL_RELOAD_SECONDS = 600
+
+
+def row_checksum(row):
+    trimmed = [str(v) for v in row]
+    while trimmed and trimmed[-1] == "":
+        trimmed.pop()
+    return hashlib.md5("\x1f".join(trimmed).encode("utf-8")).hexdigest()
+
+
+def column_letters(header, names):
+    """Map header names to column letters, skipping names the sheet does not have.
+
+    On a v1 sheet a current name is found under its old one (schema.LEGACY_RENAMES),
+    so a projection of Total_Score reads the "Score" column.
+    """
+    old_names = {new: old for old, new in LEGACY_RENAMES.items()}
+    letters = {}
+    for name in names:
+        found = name if name in header else old_names.get(name)
+        if found in header:
+            letters[name] = col_letter(header.index(found))
+    return letters
+
+
+def read_columns(sheet, letters, start):
+    """Rows from `start` to the end of the sheet, for the given column letters only."""
+    columns = sheet.batch_get([f"{L}{start}:{L}" for L in letters])
+    columns = [[r[0] if r else "" for r in col] for col in columns]
+    height = max((len(c) for c in columns), default=0)
+    return [[c[i] if i < len(c) else "" for c in columns] for i in range(height)]
+
+
+def read_row(sheet, row_number):
+    """One full sheet row (with its header) as a dict, for lazy detail views."""
+    header, values = sheet.batch_get(["1:1", f"{row_number}:{row_number}"])
+    header = header[0] if header else []
+    values = values[0] if values else []
+    return dict(zip(header, list(values) + [""] * (len(header) - len(values))))
+
+
+class SheetSnapshot:
+    def __init__(self, sheet, columns=None, cache_path=None):
+        # `sheet` may be a worksheet or a zero-arg callable that opens one, so a
+        # snapshot restored from disk does not need the API until it syncs
+        self._sheet = sheet
+        self.columns = list(columns) if columns else None  # None = every column
+        self.cache_path = cache_path
+        self.letters = []
+        self.header = []
+        self.rows = []
+        self.loaded = False
+        self.loaded_at = 0.0
+        self.synced_at = 0.0
+        self.version = 0  # bumped whenever rows change
+        self.last_error = None
+        self._lock = threading.Lock()       # guards header/rows for readers
+        self._sync_lock = threading.Lock()  # one network sync at a time
+        self._worker = None
+        if cache_path and os.path.exists(cache_path):
+            try:
+                self.load_local()
+            except Exception as e:
+                self.last_error = e
+
+    @property
+    def sheet(self):
+        if callable(self._sheet):
+            self._sheet = self._sheet()
+        return self._sheet
+
+    def _pad(self, row, width=None):
+        width = len(self.header) if width is None else width
+        return (list(row) + [""] * width)[:width]
+
+    def reset(self):
+        with self._lock:
+            self.loaded = False
+
+    def _read(self, start, header=None, letters=None):
+        header = self.header if header is None else header
+        letters = self.letters if letters is None else letters
+        if self.columns is None:
+            return self.sheet.get(f"A{start}:{col_letter(len(header) - 1)}")
+        return read_columns(self.sheet, letters, start)
+
+    def full_reload(self):
+        if self.columns is None:
+            values = self.sheet.get_all_values()
+            header, letters = (values[0] if values else []), []
+            rows = values[1:]
+        else:
+            mapping = column_letters(self.sheet.row_values(1), self.columns)
+            header, letters = list(mapping), list(mapping.values())
+            rows = self._read(2, header, letters) if letters else []
+        rows = [self._pad(r, len(header)) for r in rows]
+        with self._lock:
+            self.header, self.letters, self.rows = header, letters, rows
+            self.loaded = True
+            self.loaded_at = time.time()
+            self.version += 1
+
+    def probe(self):
+        """One small read. Returns the new rows, or None if the tail changed."""
+        tail = self.rows[-TAIL_ROWS:]
+        start = len(self.rows) - len(tail) + 2  # sheet row of the first tail row
+        fetched = self._read(start)
+        if len(fetched) < len(tail):
+            return None
+        if [row_checksum(r) for r in fetched[:len(tail)]] != [row_checksum(r) for r in tail]:
+            return None
+        return fetched[len(tail):]
+
+    def sync(self):
+        """Bring the snapshot up to date. Returns the number of rows fetched."""
+        with self._sync_lock:
+            version = self.version
+            try:
+                fetched = self._sync()
+            except Exception as e:
+                self.last_error = e
+                raise
+            self.last_error = None
+            self.synced_at = time.time()
+            if self.cache_path and self.version != version:
+                self.save_local()
+            return fetched
+
+    def _sync(self):
+        if (not self.loaded or not self.header
+                or time.time() - self.loaded_at > FULL_RELOAD_SECONDS):
+            self.full_reload()
+            return len(self.rows)
+
+        new_rows = self.probe()
+        if new_rows is None:
+            self.full_reload()
+            return len(self.rows)
+        if new_rows:
+            with self._lock:
+                self.rows = self.rows + [self._pad(r) for r in new_rows]
+                self.version += 1
+        return len(new_rows)
+
+    def refresh(self, min_interval=30.0):
+        """Serve what we have and reconcile with the sheet in the background.
+
+        Only blocks when there is nothing to show yet (first load, no local copy).
+        """
+        if not self.loaded:
+            self.sync()
+            return
+        if time.time() - self.synced_at < min_interval:
+            return
+        if self._worker is not None and self._worker.is_alive():
+            return
+
+        def run():
+            try:
+                self.sync()
+            except Exception:
+                pass  # kept in last_error; readers keep the last good snapshot
+        self._worker = threading.Thread(target=run, name="snapshot-sync", daemon=True)
+        self._worker.start()
+
+    # ------------------------------
+    # Local columnar copy (Parquet)
+    # ------------------------------
+    def save_local(self):
+        with self._lock:
+            header, letters, rows = self.header, self.letters, self.rows
+            loaded_at = self.loaded_at
+        arrays = [pa.array([r[i] for r in rows], type=pa.string()) for i in range(len(header))]
+        table = pa.Table.from_arrays(arrays, names=[str(h) for h in header])
+        table = table.replace_schema_metadata({
+            "letters": json.dumps(letters),
+            "loaded_at": str(loaded_at),
+        })
+        tmp = f"{self.cache_path}.tmp"
+        pq.write_table(table, tmp)
+        os.replace(tmp, self.cache_path)
+
+    def load_local(self):
+        table = pq.read_table(self.cache_path, memory_map=True)
+        meta = table.schema.metadata or {}
+        columns = [table.column(i).to_pylist() for i in range(table.num_columns)]
+        with self._lock:
+            self.header = list(table.column_names)
+            self.letters = json.loads(meta.get(b"letters", b"[]"))
+            self.rows = [list(r) for r in zip(*columns)]
+            # the full-reload clock keeps running from when the data was fetched
+            self.loaded_at = float(meta.get(b"loaded_at", b"0"))
+            self.loaded = True
+            self.version += 1
+
+    def frame(self):
+        with self._lock:
+            header, rows = self.header, self.rows
+        # index = sheet row number, so a row can be re-read in full later;
+        # v1 columns come out under their current names
+        return typed_frame(header, rows)
@@ -0,0 +1,319 @@
+# sheets_client.py
+# Quota-aware wrapper shared by every Streamlit session in the process.
+#
+# All worksheet calls go through one QuotaGuard:
+#   - token buckets sized to the Sheets API per-user quotas (reads and writes
+#     are metered separately), so bursts queue up locally instead of earning 429s
+#   - retries with exponential backoff and full jitter, honouring the server's
+#     Retry-After header when it sends one. Reads are retried on 429 / 5xx /
+#     connection errors; writes only on 429, the one failure known to be
+#     rejected before it is applied. After a 5xx or a timeout the write may have
+#     landed, so it is raised for the caller to reconcile (journal.Flusher
+#     checks the key columns) instead of being sent twice
+#   - request coalescing: concurrent identical reads share one API call
+#
+# It also pools the connection: credentials are parsed and authorized once per
+# process (one HTTP session with keep-alive), and spreadsheet / worksheet
+# handles are cached by (sheet_id, tab), so a write is one API call instead of
+# re-authorizing and re-opening the spreadsheet first.
+#
+# Every request sent is counted by perf.api_call() and every call is timed as
+# an "api:<method>" span, for the admin Performance tab.
+#
+# Usage: sheet = open_worksheet(SHEET_ID)                     # first tab
+#        reviews = open_worksheet(SHEET_ID, "Admin_Reviews", header=[...])
+import os
+import json
+import time
+import random
+import threading
+
+import gspread
+import requests
+from gspread.exceptions import APIError, WorksheetNotFound
+from google.oauth2.service_account import Credentials
+
+import perf
+
+SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+DEFAULT_KEY_FILE = "last-f1197-42b004ea88d5 (1).json"
+
+# Sheets API: 60 read and 60 write requests per minute per user (the service account)
+READS_PER_MINUTE = 60
+WRITES_PER_MINUTE = 60
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+WRITE_RETRY_STATUS = {429}  # rejected by the quota check, never applied
+
+READ_METHODS = {
+    "get", "get_values", "get_all_values", "get_all_records", "batch_get",
+    "row_values", "col_values", "acell", "cell", "find", "findall",
+}
+WRITE_METHODS = {
+    "update", "batch_update", "append_row", "append_rows", "insert_row", "insert_rows",
+    "delete_rows", "update_cell", "update_acell", "clear", "batch_clear",
+}
+
+
+class TokenBucket:
+    def __init__(self, per_minute, burst=None):
+        self.rate = per_minute / 60.0
+        self.capacity = burst or max(1, per_minute // 6)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class QuotaGuard:
+    def __init__(self, reads_per_minute=READS_PER_MINUTE, writes_per_minute=WRITES_PER_MINUTE,
+                 retries=5, base_delay=1.0, max_delay=32.0):
+        self.read_bucket = TokenBucket(reads_per_minute)
+        self.write_bucket = TokenBucket(writes_per_minute)
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.stats = {"calls": 0, "coalesced": 0, "retries": 0, "throttled": 0}
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def _retry_delay(self, attempt, error):
+        retry_after = None
+        response = getattr(error, "response", None)
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(self.max_delay, float(retry_after))
+            except ValueError:
+                pass
+        # full jitter: uniform in [0, min(cap, base * 2^attempt)]
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def _retryable(self, error, write=False):
+        if isinstance(error, APIError):
+            return error.response.status_code in (WRITE_RETRY_STATUS if write else RETRY_STATUS)
+        # a write that timed out or lost its connection may still have been applied
+        return not write and isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+    def call(self, write, fn, *args, **kwargs):
+        bucket = self.write_bucket if write else self.read_bucket
+        for attempt in range(self.retries + 1):
+            bucket.acquire()
+            with self._lock:
+                self.stats["calls"] += 1
+            perf.api_call()
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                if attempt == self.retries or not self._retryable(e, write):
+                    raise
+                with self._lock:
+                    self.stats["retries"] += 1
+                    if isinstance(e, APIError) and e.response.status_code == 429:
+                        self.stats["throttled"] += 1
+                time.sleep(self._retry_delay(attempt, e))
+
+    def read(self, key, fn, *args, **kwargs):
+        """Like call(), but concurrent calls with the same key share one request."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.stats["coalesced"] += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = self.call(False, fn, *args, **kwargs)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+
+# one guard per server process, shared by all sessions
+GUARD = QuotaGuard()
+
+
+class GuardedWorksheet:
+    """gspread.Worksheet proxy whose API calls go through the shared QuotaGuard."""
+
+    def __init__(self, worksheet, quota=None):
+        self._ws = worksheet
+        self._guard = quota or GUARD
+
+    def __getattr__(self, name):
+        attr = getattr(self._ws, name)
+        if name in READ_METHODS:
+            def read(*args, **kwargs):
+                key = (self._ws.spreadsheet_id, self._ws.id, name, repr(args), repr(sorted(kwargs.items())))
+                with perf.span(f"api:{name}"):
+                    return self._guard.read(key, attr, *args, **kwargs)
+            return read
+        if name in WRITE_METHODS:
+            def write(*args, **kwargs):
+                with perf.span(f"api:{name}"):
+                    return self._guard.call(True, attr, *args, **kwargs)
+            return write
+        return attr
+
+    @property
+    def spreadsheet(self):
+        return GuardedSpreadsheet(self._ws.spreadsheet, self._guard)
+
+
+class GuardedSpreadsheet:
+    def __init__(self, spreadsheet, quota=None):
+        self._ss = spreadsheet
+        self._guard = quota or GUARD
+
+    def __getattr__(self, name):
+        return getattr(self._ss, name)
+
+    @property
+    def sheet1(self):
+        return GuardedWorksheet(self._guard.call(False, lambda: self._ss.sheet1), self._guard)
+
+    def worksheet(self, title):
+        return GuardedWorksheet(self._guard.call(False, self._ss.worksheet, title), self._guard)
+
+    def add_worksheet(self, title, rows, cols, **kwargs):
+        ws = self._guard.call(True, self._ss.add_worksheet, title, rows=rows, cols=cols, **kwargs)
+        return GuardedWorksheet(ws, self._guard)
+
+
+def guard(obj, quota=None):
+    """Wrap a gspread Worksheet or Spreadsheet so it uses the shared quota guard."""
+    if isinstance(obj, (GuardedWorksheet, GuardedSpreadsheet)):
+        return obj
+    if hasattr(obj, "worksheet"):
+        return GuardedSpreadsheet(obj, quota)
+    return GuardedWorksheet(obj, quota)
+
+
+# ------------------------------
+# Connection pool
+# ------------------------------
+_clients = {}
+_spreadsheets = {}
+_worksheets = {}
+_pool_lock = threading.Lock()
+
+
+def service_account_info():
+    """Service-account dict from st.secrets (either a table or a JSON string under "key")."""
+    import streamlit as st
+    info = st.secrets["gcp_service_account"]
+    if "key" in info:
+        info = info["key"]
+    if isinstance(info, str):
+        info = json.loads(info)
+    return dict(info)
+
+
+def load_credentials(key_file=None):
+    if key_file:
+        return Credentials.from_service_account_file(key_file, scopes=SCOPES)
+    try:
+        return Credentials.from_service_account_info(service_account_info(), scopes=SCOPES)
+    except Exception:
+        # no secrets configured (local run): fall back to the key file next to the app
+        if not os.path.exists(DEFAULT_KEY_FILE):
+            raise
+        return Credentials.from_service_account_file(DEFAULT_KEY_FILE, scopes=SCOPES)
+
+
+def get_client(key_file=None):
+    """One authorized gspread client (and HTTP session) per process."""
+    with _pool_lock:
+        client = _clients.get(key_file)
+        if client is None:
+            client = gspread.authorize(load_credentials(key_file))
+            _clients[key_file] = client
+        return client
+
+
+def use_client(client):
+    """Send every later open_* call to `client` (e.g. a fake_sheets service).
+
+    Drops the cached spreadsheet and worksheet handles so nothing keeps talking
+    to the previous client.
+    """
+    with _pool_lock:
+        _clients.clear()
+        _spreadsheets.clear()
+        _worksheets.clear()
+        _clients[None] = client
+
+
+def open_spreadsheet(sheet_id, key_file=None):
+    with _pool_lock:
+        spreadsheet = _spreadsheets.get(sheet_id)
+    if spreadsheet is None:
+        client = get_client(key_file)
+        with perf.span("api:open_by_key"):
+            spreadsheet = guard(GUARD.call(False, client.open_by_key, sheet_id))
+        with _pool_lock:
+            spreadsheet = _spreadsheets.setdefault(sheet_id, spreadsheet)
+    return spreadsheet
+
+
+def open_worksheet(sheet_id, tab=None, header=None, rows=1000, cols=None, key_file=None):
+    """Cached worksheet handle. tab=None is the first tab.
+
+    If `header` is given and the tab does not exist yet, it is created with that
+    header row.
+    """
+    key = (sheet_id, tab)
+    with _pool_lock:
+        worksheet = _worksheets.get(key)
+    if worksheet is not None:
+        return worksheet
+    spreadsheet = open_spreadsheet(sheet_id, key_file)
+    with perf.span("api:open_worksheet"):
+        if tab is None:
+            worksheet = spreadsheet.sheet1
+        else:
+            try:
+                worksheet = spreadsheet.worksheet(tab)
+            except WorksheetNotFound:
+                if header is None:
+                    raise
+                worksheet = spreadsheet.add_worksheet(tab, rows=rows, cols=cols or len(header))
+                worksheet.update("A1", [header])
+    with _pool_lock:
+        return _worksheets.setdefault(key, worksheet)
+
+
+def forget(sheet_id, tab=None):
+    """Drop a cached handle, e.g. after the tab was deleted or renamed."""
+    with _pool_lock:
+        _worksheets.pop((sheet_id, tab), None)
@@ -0,0 +1,351 @@
+# storage.py
+# Where submissions, reviews and notes live, selected by config.
+#
+#   sheets  the Google Sheets the club has always used (default)
+#   sqlite  a local SQLite file, optionally mirrored to the Sheets
+#
+# Both backends hand out worksheet-like tables with the gspread calls the apps
+# already make (get / get_values / batch_get / row_values / append_rows /
+# update / batch_update), so the snapshot, journal and index code is the same
+# for either. Queries that are whole-sheet pandas passes on Sheets run as
+# indexed SQL on SQLite: the latest review per student (a window query) and
+# the admin ranking with its first-choice / department / score filters.
+#
+# Config: env ITC_STORAGE / ITC_STORE_PATH / ITC_STORAGE_MIRROR, or a
+# [storage] table in st.secrets with backend / path / mirror keys.
+#
+# With mirror on, appended rows are queued in the journal and pushed to the
+# matching sheet in the background. In-place edits (header fixes, rescore
+# writes) are not mirrored.
+import os
+import json
+import sqlite3
+import threading
+
+import pandas as pd
+from gspread.utils import a1_range_to_grid_range
+
+from perf import span
+from journal import Journal, JOURNAL_PATH, start_flusher
+from schema import (
+    CANONICAL_HEADERS, REVIEW_HEADERS, NOTE_HEADERS, FORM_LAYOUTS, REVIEW_LAYOUTS,
+    parse_values,
+)
+from sheets_client import open_worksheet
+
+FORM_SHEET_ID = "1wpyHQf51TxG7mUM6MikyGBsz9maN471y1sO03BPOEUo"
+REVIEWS_SHEET_ID = "18uodDjMAL3_haYUwoBEbM1cNtvsQKIcldAjjZKnQJd8"
+STORE_PATH = "itc_store.db"
+
+# name -> (header, key columns identifying a row)
+TABLES = {
+    "submissions": (CANONICAL_HEADERS, ["Email"]),
+    "reviews": (REVIEW_HEADERS, ["Admin_Name", "Student_Name", "Date"]),
+    "notes": (NOTE_HEADERS, ["Name", "Date"]),
+}
+LAYOUTS = {"submissions": FORM_LAYOUTS, "reviews": REVIEW_LAYOUTS, "notes": {1: NOTE_HEADERS}}
+
+
+def column_expr(header, name):
+    """SQL for one cell of a JSON-list row."""
+    return f"json_extract(data, '$[{header.index(name)}]')"
+
+
+# SQLite expressions the queries below filter and sort on; the indexes are built
+# on the same text, which is what lets the planner use them
+SCORE = f"CAST({column_expr(CANONICAL_HEADERS, 'Total_Score')} AS REAL)"
+DEPARTMENT = column_expr(CANONICAL_HEADERS, "Department")
+_ORDER = f"{column_expr(CANONICAL_HEADERS, 'Domain_Interest_Order')} || ','"
+FIRST_CHOICE = f"trim(substr({_ORDER}, 1, instr({_ORDER}, ',') - 1))"  # analytics.first_choice()
+STUDENT = column_expr(REVIEW_HEADERS, "Student_Name")
+REVIEW_DATE = column_expr(REVIEW_HEADERS, "Date")
+
+# name -> {index suffix: indexed expressions}
+INDEXES = {
+    "submissions": {
+        "score": [f"{SCORE} DESC", "row"],                         # ranking(), min_score
+        "first_choice": [FIRST_CHOICE, f"{SCORE} DESC", "row"],    # ranking(first_choices=...)
+        "department": [DEPARTMENT, f"{SCORE} DESC", "row"],        # ranking(departments=...)
+    },
+    "reviews": {
+        "latest": [STUDENT, f"{REVIEW_DATE} DESC", "row DESC"],    # latest_reviews(), no sort
+    },
+}
+
+
+def latest_per_student(reviews):
+    """Most recent review per Student_Name (the simulator's join key)."""
+    needed = {"Student_Name", "Date", "Skills_Score", "Motivation_Score"}
+    if reviews.empty or not needed.issubset(reviews.columns):
+        return pd.DataFrame()
+    return reviews.sort_values("Date").groupby("Student_Name").last()
+
+
+# ------------------------------
+# Google Sheets
+# ------------------------------
+class SheetsStorage:
+    backend = "sheets"
+
+    def __init__(self, form_sheet_id=FORM_SHEET_ID, reviews_sheet_id=REVIEWS_SHEET_ID):
+        self.locations = {
+            "submissions": (form_sheet_id, None),
+            "reviews": (reviews_sheet_id, "Admin_Reviews"),
+            "notes": (form_sheet_id, "admin_notes"),
+        }
+
+    def table(self, name):
+        sheet_id, tab = self.locations[name]
+        # named tabs are created with their header on first use
+        return open_worksheet(sheet_id, tab, header=TABLES[name][0] if tab else None)
+
+    def frame(self, name):
+        return parse_values(self.table(name).get_values(), LAYOUTS[name])
+
+    def latest_reviews(self):
+        return latest_per_student(self.frame("reviews"))
+
+
+# ------------------------------
+# SQLite
+# ------------------------------
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    return str(value)
+
+
+def _trim(values):
+    values = list(values)
+    while values and values[-1] == "":
+        values.pop()
+    return values
+
+
+class SQLiteTable:
+    """One sheet-shaped table: row 1 is the header, rows are stored as JSON lists."""
+
+    def __init__(self, storage, name):
+        self.storage = storage
+        self.title = self.name = name
+        header, _ = TABLES[name]
+        with storage._lock:
+            conn = storage._conn
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {name} (row INTEGER PRIMARY KEY, data TEXT NOT NULL)")
+            conn.execute(f"INSERT OR IGNORE INTO {name} (row, data) VALUES (1, ?)", (json.dumps(header),))
+            for suffix, exprs in INDEXES.get(name, {}).items():
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {name}_{suffix} ON {name}({', '.join(exprs)})")
+
+    @span("sqlite:read")
+    def _fetch(self, first, last):
+        sql = f"SELECT row, data FROM {self.name} WHERE row >= ?"
+        args = [first]
+        if last is not None:
+            sql += " AND row <= ?"
+            args.append(last)
+        with self.storage._lock:
+            return self.storage._conn.execute(sql + " ORDER BY row", args).fetchall()
+
+    def _grid(self, range_name=None):
+        grid = a1_range_to_grid_range(range_name) if range_name else {}
+        first = grid.get("startRowIndex", 0) + 1
+        last = grid.get("endRowIndex")
+        c0, c1 = grid.get("startColumnIndex", 0), grid.get("endColumnIndex")
+        out, expected = [], first
+        for row, data in self._fetch(first, last):
+            out.extend([] for _ in range(row - expected))  # gaps read as empty rows
+            out.append(_trim(json.loads(data)[c0:c1]))
+            expected = row + 1
+        while out and not out[-1]:
+            out.pop()
+        return out
+
+    # --- reads (gspread-compatible) ---
+    def get(self, range_name=None, **kwargs):
+        return self._grid(range_name)
+
+    def get_values(self, range_name=None, **kwargs):
+        return self._grid(range_name)
+
+    def get_all_values(self, **kwargs):
+        return self._grid()
+
+    def get_all_records(self, **kwargs):
+        values = self._grid()
+        header = values[0] if values else []
+        return [dict(zip(header, r + [""] * (len(header) - len(r)))) for r in values[1:]]
+
+    def batch_get(self, ranges, **kwargs):
+        return [self._grid(r) for r in ranges]
+
+    def row_values(self, row, **kwargs):
+        rows = self._grid(f"{row}:{row}")
+        return rows[0] if rows else []
+
+    def col_values(self, col, **kwargs):
+        return _trim((json.loads(d) + [""] * col)[col - 1] for _, d in self._fetch(1, None))
+
+    # --- writes ---
+    @span("sqlite:append")
+    def append_rows(self, values, value_input_option=None, **kwargs):
+        rows = [[_cell(v) for v in row] for row in values]
+        with self.storage._lock:
+            self.storage._conn.executemany(
+                f"INSERT INTO {self.name} (data) VALUES (?)", [(json.dumps(r, ensure_ascii=False),) for r in rows]
+            )
+        self.storage._mirror(self.name, rows)
+
+    def append_row(self, values, value_input_option=None, **kwargs):
+        self.append_rows([values], value_input_option)
+
+    def update(self, *args, **kwargs):
+        # gspread 6 is update(values, range_name); the apps still use the old
+        # update(range_name, values) order, which gspread also accepts
+        values, range_name = kwargs.get("values"), kwargs.get("range_name")
+        for arg in args:
+            if isinstance(arg, str):
+                range_name = arg
+            else:
+                values = arg
+        self._write(range_name or "A1", values)
+
+    def batch_update(self, data, **kwargs):
+        for item in data:
+            self._write(item["range"], item["values"])
+
+    @span("sqlite:write")
+    def _write(self, range_name, values):
+        grid = a1_range_to_grid_range(range_name)
+        first, c0 = grid.get("startRowIndex", 0) + 1, grid.get("startColumnIndex", 0)
+        with self.storage._lock:
+            conn = self.storage._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for offset, new in enumerate(values):
+                    row = first + offset
+                    found = conn.execute(f"SELECT data FROM {self.name} WHERE row = ?", (row,)).fetchone()
+                    data = json.loads(found[0]) if found else []
+                    data += [""] * (c0 + len(new) - len(data))
+                    data[c0:c0 + len(new)] = [_cell(v) for v in new]
+                    conn.execute(
+                        f"INSERT OR REPLACE INTO {self.name} (row, data) VALUES (?, ?)",
+                        (row, json.dumps(data, ensure_ascii=False)),
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+
+class SQLiteStorage:
+    backend = "sqlite"
+
+    def __init__(self, path=STORE_PATH, mirror=None):
+        self.path = path
+        self.mirror = mirror  # a SheetsStorage, or None
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._tables = {}
+        self._mirrors = {}
+
+    def table(self, name):
+        with self._lock:
+            if name not in self._tables:
+                self._tables[name] = SQLiteTable(self, name)
+            return self._tables[name]
+
+    def _mirror(self, name, rows):
+        if self.mirror is None:
+            return
+        with self._lock:
+            if name not in self._mirrors:
+                header, keys = TABLES[name]
+                journal = Journal(JOURNAL_PATH, f"mirror_{name}", [header.index(k) for k in keys])
+                flusher = start_flusher(journal, lambda: self.mirror.table(name), value_input_option="RAW")
+                self._mirrors[name] = (journal, flusher)
+            journal, flusher = self._mirrors[name]
+        for row in rows:
+            journal.append(row)
+        flusher.wake()
+
+    def frame(self, name):
+        return parse_values(self.table(name).get_all_values(), LAYOUTS[name])
+
+    @span("sqlite:query")
+    def _query(self, name, sql, args=()):
+        table = self.table(name)
+        with self._lock:
+            header = json.loads(self._conn.execute(f"SELECT data FROM {name} WHERE row = 1").fetchone()[0])
+            rows = self._conn.execute(sql.format(t=table.name), args).fetchall()
+        return parse_values([header] + [json.loads(d) for _, d in rows], LAYOUTS[name]) \
+            .set_axis(pd.Index([r for r, _ in rows], name="Row"))
+
+    def latest_reviews(self):
+        reviews = self._query("reviews", f"""
+            SELECT row, data FROM (
+                SELECT row, data, ROW_NUMBER() OVER (PARTITION BY {STUDENT} ORDER BY {REVIEW_DATE} DESC, row DESC) AS n
+                FROM {{t}} WHERE row > 1
+            ) WHERE n = 1
+        """)
+        return latest_per_student(reviews)
+
+    @span("sqlite:ranking")
+    def ranking(self, first_choices=(), departments=(), min_score=None, limit=None):
+        """Sheet row numbers of the matching submissions, best Total_Score first
+        (ties in sheet order), read off the INDEXES expressions."""
+        table = self.table("submissions")
+        where, args = ["row > 1"], []
+        for expr, values in ((FIRST_CHOICE, list(first_choices)), (DEPARTMENT, list(departments))):
+            if values:
+                where.append(f"{expr} IN ({', '.join('?' * len(values))})")
+                args += values
+        if min_score is not None:
+            where.append(f"{SCORE} >= ?")
+            args.append(float(min_score))
+        sql = f"SELECT row FROM {table.name} WHERE {' AND '.join(where)} ORDER BY {SCORE} DESC, row LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(sql, args + [-1 if limit is None else int(limit)]).fetchall()
+        return [r for (r,) in rows]
+
+
+# ------------------------------
+# Selection
+# ------------------------------
+_storages = {}
+_storages_lock = threading.Lock()
+
+
+def storage_config():
+    """(backend, path, mirror) from the environment, then st.secrets[storage]."""
+    conf = {}
+    try:
+        import streamlit as st
+        conf = dict(st.secrets.get("storage", {}))
+    except Exception:
+        pass  # no secrets file: defaults
+    backend = os.environ.get("ITC_STORAGE", conf.get("backend", "sheets")).lower()
+    path = os.environ.get("ITC_STORE_PATH", conf.get("path", STORE_PATH))
+    mirror = str(os.environ.get("ITC_STORAGE_MIRROR", conf.get("mirror", False))).lower() in ("1", "true", "yes")
+    return backend, path, mirror
+
+
+def get_storage(form_sheet_id=FORM_SHEET_ID, reviews_sheet_id=REVIEWS_SHEET_ID):
+    """The configured backend, one instance per process."""
+    backend, path, mirror = storage_config()
+    key = (backend, path, mirror, form_sheet_id, reviews_sheet_id)
+    with _storages_lock:
+        storage = _storages.get(key)
+        if storage is None:
+            sheets = SheetsStorage(form_sheet_id, reviews_sheet_id)
+            if backend == "sheets":
+                storage = sheets
+            elif backend == "sqlite":
+                storage = SQLiteStorage(path, mirror=sheets if mirror else None)
+            else:
+                raise ValueError(f"unknown storage backend: {backend!r}")
+            _storages[key] = storage
+        return storage
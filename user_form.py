@@ -3,18 +3,29 @@ import streamlit as st
 import pandas as pd
 import datetime
 import yagmail
-import gspread
 import threading
-import time
 import datetime
-import json
-from google.oauth2.service_account import Credentials
 import base64
+from storage import get_storage
+from schema import CANONICAL_HEADERS
+from journal import Journal, JOURNAL_PATH, start_flusher, normalize_key
+from email_index import EmailIndex, start_refresher
+from reservations import ReservationLedger, reservation_keys
+from scoring import score_applicant, normalize_domain_order
+from form_options import (
+    TECH_AREAS, TECH_LANGUAGES, TECH_PROJECTS, TECH_TOOLS,
+    MEDIA_AREAS, MEDIA_TOOLS, MEDIA_FREELANCE, MEDIA_TASKS, MEDIA_EDITING_TOOLS,
+    MEDIA_EQUIPMENT, MEDIA_PROJECTS,
+    SPONSOR_AREAS, SPONSOR_EXPERIENCE, SPONSOR_EVENT_PARTICIPATION, SPONSOR_CONNECTIONS,
+    SPONSOR_PUBLIC_SPEAKING, SPONSOR_REPRESENT_CLUB,
+)
+import perf
 
 # ------------------------------
 # CONFIG
 # ------------------------------
 st.set_page_config(page_title="ITC Club — Application Form", layout="centered")
+perf.begin_rerun("form")
 
 # Put your Logo file name in same folder or use a URL
 st.image("IMG_20251102_204411_811.png", use_container_width=True,)
@@ -46,8 +57,11 @@ page_bg = """
 # Function to set background
 def add_bg_from_local(image_file):
     """Add background image, transparent header, and dark form style."""
-    with open(image_file, "rb") as f:
-        encoded = base64.b64encode(f.read()).decode()
+    try:
+        with open(image_file, "rb") as f:
+            encoded = base64.b64encode(f.read()).decode()
+    except FileNotFoundError:
+        return  # image not deployed with this checkout: keep the default theme
 
     st.markdown(
         f"""
@@ -112,118 +126,68 @@ add_bg_from_local("IMG.jpg")
 # ------------------------------
 SHEET_ID = "1wpyHQf51TxG7mUM6MikyGBsz9maN471y1sO03BPOEUo"
 
-CANONICAL_HEADERS = [
-    # --- Basic Info ---
-    "Name", "Email", "Phone", "Student_ID", "Department", "Academic_Year",
-    "FB_Link", "Discord_ID", "Date_Birth",
-
-    # --- Domain Preferences ---
-    "Domain_Interest_Order",
-
-    # --- Tech Domain ---
-    "Tech_Areas",
-    "Tech_Programming_Languages",
-    "Tech_Project_Desc",
-    "Tech_Portfolio",
-    "Tech_Tools",
-    "Tech_Self_Rate",
-    "Tech_Score",
-
-    # --- Media Domain ---
-    "Media_Areas",
-    "Media_Tools",
-    "Media_Freelance",
-    "Media_Tasks",
-    "Media_Editing_Tools",
-    "Media_Equipment",
-    "Media_Portfolio",
-    "Media_Project_Desc",
-    "Media_DesignRate",
-    "Media_EditingRate",
-    "Media_Score",
-
-    # --- Sponsoring Domain ---
-    "Sponsor_Areas",
-    "Sponsor_Exp_Desc",
-    "Sponsor_Event_Participation",
-    "Sponsor_Connections",
-    "Sponsor_Public_Speaking",
-    "Sponsor_Represent_Club",
-    "Sponsor_Comm_Rate",
-    "Sponsor_Score",
-
-    # --- Motivation & Availability ---
-    "Why_Join",
-    "What_Learn",
-    "Other_Club",
-    "Leadership",
-    "Challenge",
-    "Manage_Time",
-    "Communication_Skills",
-    "Public_Speaking",
-    "Anything_To_Add",
-
-    # --- Final Scoring & Meta ---
-    "Total_Score",
-    "Submission_Date"
-]
-
-
-
-
-# ------------------------------
-# Helpers: GSpread client (secrets fallback)
-# ------------------------------
-def get_gspread_client():
-    try:
-        info = st.secrets["gcp_service_account"]["key"]
-        info = json.loads(info)
-        creds = Credentials.from_service_account_info(
-            info, scopes=["https://www.googleapis.com/auth/spreadsheets"]
-        )
-        client = gspread.authorize(creds)
-        return client
-    except Exception as e:
-        st.error(f"❌ Error creating GSpread client: {e}")
-        st.stop()
 
 # ---------------------------
-# Open the form sheet
+# Open the form sheet (storage backend from config, see storage.py)
 # ---------------------------
-@st.cache_resource
+@perf.span("open_form_sheet")
 def open_form_sheet(sheet_id):
-    client = get_gspread_client()
     try:
-        sheet = client.open_by_key(sheet_id).sheet1
-        return sheet
+        return get_storage(form_sheet_id=sheet_id).table("submissions")
     except Exception as e:
         st.error(f"❌ Could not connect to Form Sheet: {e}")
         st.stop()
 
 sheet = open_form_sheet(SHEET_ID)
 
-# ensure header row exists and matches canonical headers
-def ensure_headers(sheet):
-    try:
-        current = sheet.row_values(1)
-        if current[:len(CANONICAL_HEADERS)] != CANONICAL_HEADERS:
-            sheet.update("A1", [CANONICAL_HEADERS])
-    except Exception as e:
-        st.warning(f"Could not ensure headers: {e}")
-
-ensure_headers(sheet)
-
-# Append with retry
-def append_row_with_retry(sheet, row, retries=3, backoff=0.4): # sheet,
-    last_exc = None
-    for i in range(retries):
-        try:
-            sheet.append_row(row, value_input_option="USER_ENTERED")
-            return True
-        except Exception as e:
-            last_exc = e
-            time.sleep(backoff * (i + 1))
-    raise last_exc
+# ensure header row exists and matches canonical headers -- once per process,
+# not on every rerun (a failure is not cached, so the next visitor retries)
+@perf.tracked(st.cache_resource(show_spinner=False))
+def ensure_headers(sheet_id, _sheet):
+    current = _sheet.row_values(1)
+    if current[:len(CANONICAL_HEADERS)] != CANONICAL_HEADERS:
+        _sheet.update("A1", [CANONICAL_HEADERS])
+    return True
+
+try:
+    ensure_headers(SHEET_ID, sheet)
+except Exception as e:
+    st.warning(f"Could not ensure headers: {e}")
+
+# ------------------------------
+# Submission journal: rows are stored locally first, then flushed to the sheet
+# in batches by a background thread (see journal.py)
+# ------------------------------
+@perf.tracked(st.cache_resource)
+def get_submission_journal(_sheet):
+    journal = Journal(JOURNAL_PATH, "submissions", key_cols=[CANONICAL_HEADERS.index("Email")])
+    flusher = start_flusher(journal, _sheet)
+    return journal, flusher
+
+journal, flusher = get_submission_journal(sheet)
+
+# ------------------------------
+# Duplicate index: Email / Student_ID loaded once, checked in memory
+# ------------------------------
+@perf.tracked(st.cache_resource)
+def get_email_index(_sheet):
+    index = EmailIndex(
+        _sheet,
+        email_col=CANONICAL_HEADERS.index("Email"),
+        student_id_col=CANONICAL_HEADERS.index("Student_ID"),
+    )
+    index.refresh()
+    start_refresher(index)
+    return index
+
+email_index = get_email_index(sheet)
+
+# shared by every session; the SQLite file is shared by every server process
+@perf.tracked(st.cache_resource)
+def get_reservation_ledger():
+    return ReservationLedger(JOURNAL_PATH)
+
+ledger = get_reservation_ledger()
 
 # Set your global closing time (UTC or local)
 CLOSING_TIME = datetime.datetime(2026, 11, 5, 23, 59)  # 
@@ -313,49 +277,37 @@ if remaining.total_seconds() > 0:
             st.markdown("---")
         
             st.subheader("💻 Tech Domain")
-            tech_areas = st.multiselect("**💡 Which areas interest you?**", ["Robotics","AI/ML","Security","Front-End","Back-End","Mobile","Game Dev","UI/UX"])
-            tech_languages = st.multiselect("**💻 Programming languages**", ["Python","C/C++","Java","JavaScript /TypeScript","C#","Dart (Flutter)","PHP","SQL","None yet, but I’m learning"])
-            tech_project_desc = st.multiselect("🧠 Describe a project / competition / experience", ["Participated in national or international competitions","Designed (alone or in a team) the UI/UX of an app or website","Built a fully functional robot","Developed a responsive website","Trained an AI model","Created a game","Modeled or implemented a security system","Developed a fully functional mobile application","Created an original project or innovative solution", "Modified or improved existing ideas or systems", "Conduct practical experiments or hands-on technical tests occasionally","Not yet, but excited to start"])
+            tech_areas = st.multiselect("**💡 Which areas interest you?**", TECH_AREAS)
+            tech_languages = st.multiselect("**💻 Programming languages**", TECH_LANGUAGES)
+            tech_project_desc = st.multiselect("🧠 Describe a project / competition / experience", TECH_PROJECTS)
             tech_portfolio = st.selectbox("**🌐 Do you have a portfolio?**", ["yes","no"])
-            tech_tools = st.multiselect("🧰 Tools", ["Arduino / ESP32 / Raspberry Pi /sensors","Unity","Figma","Java","Git/GitHub","Linux","Database(SQL / MongoDB)","Docker/VM","VS Code / IntelliJ / PyCharm","APIs / Postman","Cloud Services (AWS, Firebase, etc.)","Flutter","No, but I’d like to try"])
+            tech_tools = st.multiselect("🧰 Tools", TECH_TOOLS)
             tech_self_rate = st.slider("**Rate yourself (0–5)**", 0, 5, 0)
 
             st.markdown("---")
             st.subheader("🎨 Design & Media Section")
-            media_areas = st.multiselect("**💡 Which design areas?**", ["Graphic Design","UI UX","Illustration","Motion Graphics","3D Modeling"]) # 2 pts per selected (max 5) , max = 10 
-            media_tools = st.multiselect("**🎨 Which tools or software do you use?**", ["Adobe Illustrator","Photoshop","Figma","Canva","InDesign","Other","None, but I’d like to learn"]) # 2	Tools/software used	Multiple choice	2 pts per selected (max 5)	10 , max = 10
-            media_freelance_exp = st.selectbox("**Have you worked as a freelancer or with a company before?**", ["Yes","No","Not yet, but I’d like to"]) #Yes 10 / Want 3/ No 0
-            media_tasks = st.multiselect("Which media tasks do you enjoy most? ", ["Photography","Videography","Video Editing","Script / Caption Writing","Social Media Management","Voice Recording / Narration","Acting"])# 3 pts per selected (max 6) , max = 18
-            media_editing_tools = st.multiselect("**Which tools do you use for editing?**", ["Adobe Premiere Pro","CapCut","DaVinci Resolve","Adobe Audition","Audacity","None"]) # 2 pts per selected (max 6)
-            media_deep_tools = st.multiselect("**Have you ever explored or owned any of these tools/resources?**", ["Camera","Smartphone with good camera","Microphone","Lighting Setup","Tripod / Stabilizer","SD cards / External storage","None"]) # 2 pt per selected (max 6)
+            media_areas = st.multiselect("**💡 Which design areas?**", MEDIA_AREAS) # 2 pts per selected (max 5) , max = 10 
+            media_tools = st.multiselect("**🎨 Which tools or software do you use?**", MEDIA_TOOLS) # 2	Tools/software used	Multiple choice	2 pts per selected (max 5)	10 , max = 10
+            media_freelance_exp = st.selectbox("**Have you worked as a freelancer or with a company before?**", MEDIA_FREELANCE) #Yes 10 / Want 3/ No 0
+            media_tasks = st.multiselect("Which media tasks do you enjoy most? ", MEDIA_TASKS)# 3 pts per selected (max 6) , max = 18
+            media_editing_tools = st.multiselect("**Which tools do you use for editing?**", MEDIA_EDITING_TOOLS) # 2 pts per selected (max 6)
+            media_deep_tools = st.multiselect("**Have you ever explored or owned any of these tools/resources?**", MEDIA_EQUIPMENT) # 2 pt per selected (max 6)
             media_portfolio = st.selectbox("**🌐 Do you have a portfolio ?**", ["yes","no"],key=1)# 0
             media_project_desc = st.multiselect(
                 "**🧠 Describe a media-related project or experience**",
-                [
-                    # -1 items
-                    "Participated in a design competition -1",
-                    "Tried taking professional photos -1",
-                    "Managed media coverage or promotional content -1",
-                    "Tried or currently doing content creation -1",
-                    # -2 items
-                    "Created a complete project (poster, logo, UI/UX, 3D model, etc.) -2",
-                    "Designed for real events, clients, or organizations -2",
-                    "Created a short film or video project -2",
-                    "Made a marketing strategy / understand social media algorithms -2",
-                    "Good at voice acting or acting -2"
-                ]
+                MEDIA_PROJECTS
             )
             media_designrate = st.slider("**Rate experience (0–5)**",0,5,0) # 12 / 24 / 36 / 48 / 510
             media_editingrate = st.slider("Rate your editing skills (0–5)",0,5,0) # 11 / 22 / 33 / 45 / 57
 
             st.markdown("---")
             st.subheader("💼 Sponsoring Domain")
-            sponsor_areas = st.multiselect("**💡 Which type of activities interest you?**", ["Searching for sponsors","Writing emails","Negotiation & Partnerships","Marketing and promotion","Communication and network","Other"]) # 1	Activities of interest	Multiple choice	8 pts per selected (max 5)	40
-            sponsor_exp = st.multiselect("**Do you have prior experience in any of these?**", ["Contacting or negotiating with sponsors","Writing partnership proposals", "Managing event logistics (venue, materials, setup…)", "Communicating with partners or companies", "Handling budgets or sponsorship funds", "None"]) # 2ptc per choice (max 5) , if none = o
-            sponsor_event_participation = st.selectbox("**Have you ever participated in organizing an event or project?**", ["Yes, many times","Yes, once or twice","No, but I'd like to learn"]) # None0 / Once4 / Many10
-            sponsor_connections = st.selectbox("**Do you have connections that could help find sponsors?**", ["Yes","Maybe","No"]) # Yes10 / Maybe5 / No0
-            sponsor_public_speaking = st.selectbox("**Are you comfortable speaking or presenting in front of others?**", ["Yes, confidently","Sometimes","Not really, but I’d like to get better","No, I prefer working behind the scenes"]) # No0 / Not really2 / Sometimes5 / Yes
-            sponsor_represent_club = st.selectbox("**Are you interested in representing the club externally (meetings, sponsors, events)?**", ["Yes, definitely","Maybe","Not really"]) # Yes8 / Maybe4 / No0
+            sponsor_areas = st.multiselect("**💡 Which type of activities interest you?**", SPONSOR_AREAS) # 1	Activities of interest	Multiple choice	8 pts per selected (max 5)	40
+            sponsor_exp = st.multiselect("**Do you have prior experience in any of these?**", SPONSOR_EXPERIENCE) # 2ptc per choice (max 5) , if none = o
+            sponsor_event_participation = st.selectbox("**Have you ever participated in organizing an event or project?**", SPONSOR_EVENT_PARTICIPATION) # None0 / Once4 / Many10
+            sponsor_connections = st.selectbox("**Do you have connections that could help find sponsors?**", SPONSOR_CONNECTIONS) # Yes10 / Maybe5 / No0
+            sponsor_public_speaking = st.selectbox("**Are you comfortable speaking or presenting in front of others?**", SPONSOR_PUBLIC_SPEAKING) # No0 / Not really2 / Sometimes5 / Yes
+            sponsor_represent_club = st.selectbox("**Are you interested in representing the club externally (meetings, sponsors, events)?**", SPONSOR_REPRESENT_CLUB) # Yes8 / Maybe4 / No0
             sponsor_comm_rate = st.slider("**Rate your confidence in communication & negotiation**",0,5,0) # 12 / 24 / 36 / 49 / 512
 
             st.markdown("---")
@@ -382,16 +334,12 @@ if remaining.total_seconds() > 0:
                 if not (name and email):
                     st.error("Please fill required fields: Name, Email, Why join, Motivation.")
                 else:
-                    # prevent duplicate by email (check sheet)
+                    # prevent duplicate by email / student id (in-memory index + unflushed journal rows)
                     try:
-                        rows = sheet.get_all_records()
-                        existing_emails = {
-                            str(r.get("Email", "")).strip().lower()
-                            for r in rows
-                            if str(r.get("Email", "")).strip()
-                        }
-                        if email.strip().lower() in existing_emails:
-                            st.warning("An application with this email already exists. If this is an error, contact the admin.")
+                        with perf.span("duplicate_check"):
+                            duplicate = email_index.contains(email, student_id) or journal.has_key(normalize_key([email]))
+                        if duplicate:
+                            st.warning("An application with this email or student ID already exists. If this is an error, contact the admin.")
                         else:
 
                             a = st.session_state.get("first_domain")
@@ -404,141 +352,6 @@ if remaining.total_seconds() > 0:
                                 domain_order = [a, b, c]
                                 st.session_state["domain_order"] = domain_order
 
-                                # compute score (same logic as earlier; keep consistent)
-                                def compute_domain_score(domain, dd):
-                                    if domain == "Tech":
-                                        # Areas: 3 pts per selected, max 8, max = 24
-                                        s = min(len(dd.get("areas", [])), 8) * 3
-
-                                        # Languages: 2 pts per selected, max 8, max = 16
-                                        s += min(len(dd.get("languages", [])), 8) * 2
-
-                                        # Project description: each 2 pts except special cases
-                                        project_descs = dd.get("project_desc", [])
-                                        project_pts = 0
-                                        for p in project_descs:
-                                            if p in [
-                                                "Modified or improved existing ideas or systems",
-                                                "Conduct practical experiments or hands-on technical tests occasionally",
-                                            ]:
-                                                project_pts += 1
-                                            elif p == "Not yet, but excited to start":
-                                                project_pts += 0
-                                            else:
-                                                project_pts += 2
-                                        s += project_pts
-
-                                        # Tools: 3 pts per selected, max 10, max = 30 (exclude "No, but I’d like to try")
-                                        tools = dd.get("tools", [])
-                                        tool_pts = sum(3 for t in tools if t != "No, but I’d like to try")
-                                        s += min(tool_pts, 30)
-
-                                        # Portfolio: always 0 pts
-                                        s += 0
-
-                                        # Self rate: scale 1→2 / 2→5 / 3→7 / 4→9 / 5→12
-                                        s += {0: 0, 1: 2, 2: 5, 3: 7, 4: 9, 5: 12}.get(dd.get("self_rate", 3), 7)
-
-                                        return s
-
-                                    elif domain == "Media":
-                                        s = 0
-
-                                        # 🎨 Areas: 2 pts per selected (max 5), max = 10
-                                        s += min(len(dd.get("areas", [])), 5) * 2
-
-                                        # 🧰 Tools: 2 pts per selected (max 5), max = 10
-                                        tools = dd.get("tools", [])
-                                        tool_pts = sum(2 for t in tools if t != "None, but I’d like to learn")
-                                        s += min(tool_pts, 10)
-
-                                        # 💼 Freelance experience: Yes = 10 / Want = 3 / No = 0
-                                        freelance_exp = dd.get("freelance_exp", "")
-                                        if freelance_exp == "Yes":
-                                            s += 10
-                                        elif freelance_exp == "Not yet, but I’d like to":
-                                            s += 3
-                                        else:
-                                            s += 0
-
-                                        # 🎬 Media tasks: 3 pts per selected (max 6), max = 18
-                                        s += min(len(dd.get("media_tasks", [])), 6) * 3
-
-                                        # ✂️ Editing tools: 2 pts per selected (max 6), max = 12
-                                        s += min(len(dd.get("editing_tools", [])), 6) * 2
-
-                                        # 🎥 Deep tools: 2 pts per selected (max 6), max = 12
-                                        s += min(len(dd.get("deep_tools", [])), 6) * 2
-
-                                        # 🌐 Portfolio: 0 pts
-                                        s += 0
-
-                                        # 🧠 Media project desc — each has custom point value
-                                        project_descs = dd.get("project_desc", [])
-                                        project_pts = 0
-                                        for p in project_descs:
-                                            if "-2" in p:
-                                                project_pts += 2
-                                            elif "-1" in p:
-                                                project_pts += 1
-                                        s += project_pts
-
-                                        # 🧑‍🎨 Design rate: 1→2 / 2→4 / 3→6 / 4→8 / 5→10
-                                        s += {0: 0, 1: 2, 2: 4, 3: 6, 4: 8, 5: 10}.get(dd.get("designrate", 3), 6)
-
-                                        # ✂️ Editing rate: 1→1 / 2→2 / 3→3 / 4→5 / 5→7
-                                        s += {0: 0, 1: 1, 2: 2, 3: 3, 4: 5, 5: 7}.get(dd.get("editingrate", 3), 3)
-
-                                        return s
-
-                                    else:
-                                        s = 0
-
-                                        # 💡 Activities of interest: 8 pts per selected (max 5), max = 25
-                                        s += min(len(dd.get("areas", [])), 5) * 5
-
-                                        # 🧠 Experience: 2 pts per selected (max 5), 'None' = 0
-                                        exp = dd.get("exp", [])
-                                        if "None" in exp:
-                                            s += 0
-                                        else:
-                                            s += min(len(exp), 5) * 5
-
-                                        # 🎟️ Event participation: Many=10 / Once=4 / Want=0
-                                        s += {
-                                            "Yes, many times": 10,
-                                            "Yes, once or twice": 4,
-                                            "No, but I'd like to learn": 0,
-                                        }.get(dd.get("event_participation"), 0)
-
-                                        # 🤝 Connections: Yes=10 / Maybe=5 / No=0
-                                        s += {
-                                            "Yes": 10,
-                                            "Maybe": 5,
-                                            "No": 0,
-                                        }.get(dd.get("connections"), 0)
-
-                                        # 🎤 Public speaking: Yes=10 / Sometimes=5 / Not really=2 / No=0
-                                        s += {
-                                            "Yes, confidently": 10,
-                                            "Sometimes": 5,
-                                            "Not really, but I’d like to get better": 2,
-                                            "No, I prefer working behind the scenes": 0,
-                                        }.get(dd.get("public_speaking"), 0)
-
-                                        # 🏛️ Represent club externally: Yes=8 / Maybe=4 / Not really=0
-                                        s += {
-                                            "Yes, definitely": 8,
-                                            "Maybe": 4,
-                                            "Not really": 0,
-                                        }.get(dd.get("represent_club"), 0)
-
-                                        # 💬 Communication & negotiation rate: 1→2 / 2→4 / 3→6 / 4→9 / 5→12
-                                        s += {0: 0, 1: 2, 2: 4, 3: 6, 4: 9, 5: 12}.get(dd.get("comm_rate", 3), 6)
-
-                                        return s
-
-
                                 # 💻 TECH DOMAIN
                                 tech_data = {
                                     "areas": tech_areas,
@@ -574,43 +387,10 @@ if remaining.total_seconds() > 0:
                                     "comm_rate": sponsor_comm_rate
                                 }
 
-                                # --- Domain Weights Based on Order ---
-                                weights = {}
-                                if isinstance(domain_order, list):
-                                    # Normalize domain names (capitalize first letter for matching)
-                                    domain_order = [d.strip().capitalize() for d in domain_order]
-                                else:
-                                    domain_order = [d.strip().capitalize() for d in str(domain_order).split(",")]
-
-                                # Default weight
-                                weights = {d: 0 for d in ["Tech", "Media", "Sponsoring"]}
-
-                                for i, d in enumerate(domain_order):
-                                    if i == 0:
-                                        weights[d] = 0.6
-                                    elif i == 1:
-                                        weights[d] = 0.25
-                                    elif i == 2:
-                                        weights[d] = 0.15
-
-                                # --- Compute domain scores individually ---
-                                domain_scores = {
-                                    "Tech": compute_domain_score("Tech", tech_data),
-                                    "Media": compute_domain_score("Media", media_data),
-                                    "Sponsoring": compute_domain_score("Sponsoring", sponsor_data)
-                                }
-
-                                # --- Weighted total domain score ---
-                                domain_score = (
-                                    (domain_scores.get(domain_order[0], 0) * 0.6) +
-                                    (domain_scores.get(domain_order[1], 0) * 0.25) +
-                                    (domain_scores.get(domain_order[2], 0) * 0.15)
-                                ) / 3
-
-                                domain_score = round(domain_score, 2)
-
-                                # ✅ Final total = only domain score (no motivation yet)
-                                total_score = domain_score
+                                # --- Domain scores and weighted total (see scoring.py) ---
+                                domain_order = normalize_domain_order(domain_order)
+                                with perf.span("score_applicant"):
+                                    domain_scores, total_score = score_applicant(domain_order, tech_data, media_data, sponsor_data)
 
                                 # date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                                 # domain_extra = domain_data.get("project_desc","") or domain_data.get("exp_desc","") or ""
@@ -675,10 +455,20 @@ if remaining.total_seconds() > 0:
                                     datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                                 ]
 
-                                # append with retry
+                                # reserve email / student id atomically across sessions and processes
+                                keys = reservation_keys(email, student_id)
+                                with perf.span("reserve"):
+                                    reserved = ledger.reserve(keys)
+                                if not reserved:
+                                    st.warning("An application with this email or student ID already exists. If this is an error, contact the admin.")
+                                    st.stop()
+
+                                # store in the local journal; the flusher pushes it to the sheet
                                 try:
-                                    append_row_with_retry(sheet,row)
-                                    
+                                    with perf.span("journal.append"):
+                                        journal.append(row)
+                                    email_index.add(email, student_id)
+
                                     # st.balloons()
                                     st.session_state.submitted = True
                                     st.session_state.name = name
@@ -695,6 +485,7 @@ if remaining.total_seconds() > 0:
                                     go_to_info()
 
                                 except Exception as e:
+                                    ledger.release(keys)
                                     st.error(f"❌ Failed to save application: {e}")
                                 
                     except Exception as e:
@@ -734,6 +525,8 @@ if remaining.total_seconds() > 0:
         # )
 
         st.button("⬅️ Back to Form", on_click=lambda: st.session_state.update(page="form"))
+
+    perf.end_rerun()
 else:   
     # ------------------------------
     # TIMER EXPIRED — DISABLE FORM